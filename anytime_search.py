@@ -0,0 +1,255 @@
+from time import perf_counter
+
+from node import Node
+from frontier import Frontier
+
+
+class AnytimeSearch:
+    """
+    ********************************************************************
+    *
+    * Class name: AnytimeSearch
+    *
+    * Name of the original author: Carlos Ruiz García-Casarrios
+    *
+    * Description of the class: The AnytimeSearch class implements the
+    * ANYTIME strategy of T3, an anytime repairing A* (ARA*). It starts as
+    * a weighted A* that orders the frontier by cost + w * heuristic with a
+    * high weight w, which finds a first solution quickly, and then lowers
+    * the weight step by step down to 1 (plain A*) to find better ones. The
+    * table with the best cost found for every state is kept between the
+    * rounds: a round only expands each state once, the states reached
+    * again with a lower cost after being expanded are set aside and put
+    * back in the frontier at the next round, and the nodes that cannot
+    * lead to a cheaper solution than the current one are discarded. The
+    * search stops when the round with weight 1 ends, which proves the
+    * last solution optimal, or when the node or time budget runs out.
+    *
+    * Every solution found is reported on the log stream of the level
+    * (Sokoban.report, the standard error by default) with its cost
+    * and its suboptimality bound: the solution costs at most bound times
+    * the optimal one. The bound is the lower of the weight and the cost
+    * divided by the lowest cost + heuristic among the nodes that are left.
+    * The last solution is printed on the standard output like the other
+    * strategies. The heuristics are admissible, so the bounds hold.
+    *
+    * Required Files: sokoban.py (successors and heuristics), frontier.py
+    *
+    *********************************************************************
+    """
+
+    def __init__(self, sokoban, max_depth, pruning=True, mode='MOVES', heuristic='MANHATTAN', weight=5.0,
+                 weight_step=0.5, max_nodes=None, max_seconds=None, progress=None):
+        """
+        ********************************************************************
+        *
+        * Method name: __init__
+        *
+        * Description: Stores the level and the configuration of the search.
+        *
+        * Calling arguments:
+        * - sokoban: The Sokoban level to solve.
+        * - max_depth: Maximum depth of the search.
+        * - pruning: Whether deadlock pruning is enabled.
+        * - mode: Search mode (MOVES or PUSHES).
+        * - heuristic: Heuristic (MANHATTAN, PUSH or ASSIGNMENT).
+        * - weight: Weight of the heuristic in the first round (at least 1).
+        * - weight_step: Amount the weight is lowered after every round.
+        * - max_nodes: Maximum number of expanded nodes, or None.
+        * - max_seconds: Maximum search time in seconds, or None.
+        * - progress: Optional shared value where the number of expanded
+        *   nodes is published.
+        *
+        * Return value: None
+        *********************************************************************
+        """
+        self.sokoban = sokoban
+        self.max_depth = max_depth
+        self.pruning = pruning
+        self.mode = mode
+        self.expand = sokoban.generate_push_succesors if mode == 'PUSHES' else sokoban.generate_succesors
+        self.estimator = sokoban.heuristic_estimator(heuristic)
+        self.weight = max(1.0, weight)
+        self.weight_step = weight_step
+        self.max_nodes = max_nodes
+        self.max_seconds = max_seconds
+        self.progress = progress
+        self.expanded = 0
+        self.bound = float('inf')
+        self.stopped = False  # True if the budget ran out
+
+    def run(self, initial_node):
+        """
+        ********************************************************************
+        *
+        * Method name: run
+        *
+        * Description: Runs the rounds until the last solution is proven
+        * optimal or the budget runs out, reporting every solution on the
+        * log stream of the level as it is found.
+        *
+        * Calling arguments:
+        * - initial_node: Node of the initial state (already numbered).
+        *
+        * Return value: List with the nodes of the best solution path after
+        * the initial node, or None if no solution was found.
+        *********************************************************************
+        """
+        started = perf_counter()
+        best = None
+        for number, (path, cost, weight) in enumerate(self.solutions(initial_node), 1):
+            best = path
+            self.sokoban.report(f"Solution:{number},Weight:{weight:.2f},Cost:{cost:.2f},Bound:{self.bound:.2f},"
+                                f"Expanded:{self.expanded},Time:{perf_counter() - started:.4f}s")
+        self.sokoban.report(f"Stopped:{'BUDGET' if self.stopped else 'COMPLETE'},Bound:{self.bound:.2f},"
+                            f"Expanded:{self.expanded},Time:{perf_counter() - started:.4f}s")
+        if self.progress is not None:
+            self.progress.value = self.expanded
+
+        if best is not None and self.mode == 'PUSHES':
+            self.sokoban.expand_push_actions(best)
+        return best
+
+    def out_of_budget(self, started):
+        """
+        ********************************************************************
+        *
+        * Method name: out_of_budget
+        *
+        * Description: Checks the node and time budgets.
+        *
+        * Calling arguments:
+        * - started: perf_counter() value when the search started.
+        *
+        * Return value: True if a budget has run out, False otherwise.
+        *********************************************************************
+        """
+        if self.max_nodes is not None and self.expanded >= self.max_nodes:
+            return True
+        return self.max_seconds is not None and perf_counter() - started >= self.max_seconds
+
+    def update_bound(self, cost, weight, nodes):
+        """
+        ********************************************************************
+        *
+        * Method name: update_bound
+        *
+        * Description: Computes the suboptimality bound of a solution from the
+        * nodes left to search: no solution can cost less than their lowest
+        * cost + heuristic.
+        *
+        * Calling arguments:
+        * - cost: Cost of the best solution.
+        * - weight: Weight of the current round.
+        * - nodes: Nodes of the frontier and the ones set aside.
+        *
+        * Return value: None (sets the bound attribute).
+        *********************************************************************
+        """
+        lowest = min((node.cost + node.heuristic for node in nodes), default=float('inf'))
+        self.bound = max(1.0, min(weight, cost / lowest if lowest > 0 else weight))
+
+    def solutions(self, initial_node):
+        """
+        ********************************************************************
+        *
+        * Method name: solutions
+        *
+        * Description: Runs the weighted A* rounds, yielding every solution
+        * that improves the previous one.
+        *
+        * Calling arguments:
+        * - initial_node: Node of the initial state (already numbered).
+        *
+        * Return value: Generator of (path, cost, weight) tuples, where the
+        * path is the list of nodes after the initial node.
+        *********************************************************************
+        """
+        sokoban = self.sokoban
+        board = sokoban.board
+        node_ids = sokoban.node_ids
+        keep_keys = self.mode == 'PUSHES'
+        started = perf_counter()
+        initial_node.assign_heuristic("A*", sokoban.boxes_cells, sokoban.targets_position, self.estimator)
+        initial_node.boxes_on_target = sum(board.targets[box] for box in sokoban.boxes_cells)
+        weight = self.weight
+        initial_node.assign_value("A*", weight)
+
+        best_costs = {initial_node.key(): initial_node.cost}  # Kept between the rounds
+        frontier = Frontier()
+        frontier.add(initial_node)
+        inconsistent = []  # Nodes reached with a lower cost after their state was expanded
+        best_cost = float('inf')
+
+        while True:
+            closed = set()
+            solution = None
+            while not frontier.is_empty():
+                node = frontier.pop("A*")
+                if node.value >= best_cost:
+                    frontier.add(node)  # Nothing left in this round can improve the solution
+                    break
+                if node.is_goal():
+                    solution = node
+                    break
+                state_key = node.key()
+                if node.cost > best_costs[state_key] or state_key in closed or node.depth >= self.max_depth:
+                    continue
+                if self.out_of_budget(started):
+                    self.stopped = True
+                    frontier.add(node)
+                    break
+                closed.add(state_key)
+                self.expanded += 1
+                if self.progress is not None and self.expanded % 1024 == 0:
+                    self.progress.value = self.expanded
+                for action, new_state_key, cost, new_player_pos, new_boxes_pos in \
+                        self.expand(node.player_position, node.boxes_position, self.pruning):
+                    if not keep_keys:
+                        new_state_key = (new_player_pos, new_boxes_pos)
+                    new_cost = node.cost + cost
+                    if new_cost >= best_costs.get(new_state_key, float('inf')):
+                        continue
+                    best_costs[new_state_key] = new_cost
+                    child = Node(next(node_ids), node, None, 0, node.depth + 1, new_cost, 0.00, action,
+                                 new_boxes_pos, new_player_pos, new_state_key if keep_keys else None)
+                    if action.isupper():
+                        moved_to = new_player_pos + board.offsets[action]
+                        child.inherit_heuristic("A*", board.targets, self.estimator, new_player_pos, moved_to)
+                    else:
+                        child.inherit_heuristic("A*", board.targets, self.estimator)
+                    if child.cost + child.heuristic >= best_cost:
+                        continue  # Cannot lead to a cheaper solution
+                    child.assign_value("A*", weight)
+                    if new_state_key in closed:
+                        inconsistent.append(child)
+                    else:
+                        frontier.add(child)
+
+            if solution is not None:
+                best_cost = solution.cost
+                self.update_bound(best_cost, weight, [entry[2] for entry in frontier.nodes] + inconsistent)
+                path = []
+                node = solution
+                while node.parent_id is not None:
+                    path.append(node)
+                    node = node.parent_id
+                path.reverse()
+                yield path, best_cost, weight
+            if self.stopped:
+                if solution is None and best_cost < float('inf'):
+                    self.update_bound(best_cost, weight, [entry[2] for entry in frontier.nodes] + inconsistent)
+                return
+            if weight == 1.0 or (frontier.is_empty() and not inconsistent):
+                self.bound = 1.0 if best_cost < float('inf') else self.bound
+                return
+
+            # Next round: lower weight, with the set aside nodes back in the frontier
+            weight = max(1.0, weight - self.weight_step)
+            nodes = [entry[2] for entry in frontier.nodes] + inconsistent
+            frontier = Frontier()
+            inconsistent = []
+            for node in nodes:
+                if node.cost + node.heuristic < best_cost:
+                    node.assign_value("A*", weight)
+                    frontier.add(node)
@@ -0,0 +1,246 @@
+from collections import OrderedDict
+
+
+class AssignmentHeuristic:
+    """
+    ********************************************************************
+    *
+    * Class name: AssignmentHeuristic
+    *
+    * Name of the original author: Carlos Ruiz García-Casarrios
+    *
+    * Description of the class: The AssignmentHeuristic class estimates the
+    * cost to the goal as the minimum-cost matching between boxes and
+    * targets, where the cost of sending a box to a target is the wall-aware
+    * push distance precomputed by the board index. Unlike sending every
+    * box to its nearest target, no two boxes can share a target, so the
+    * bound is much tighter while staying admissible.
+    *
+    * The matching is solved with the Hungarian algorithm on a square
+    * matrix (one row per box plus zero-cost dummy rows up to the number of
+    * targets). The solution of each box configuration (dual potentials and
+    * matching) is kept in a bounded LRU cache, so when a push moves one box
+    * only that box's row is replaced and a single augmentation, O(T^2),
+    * restores the optimal matching. Player walks do not move any box and
+    * hit the cache directly.
+    *
+    * Required Files: board_index.py (push distance tables)
+    *
+    *********************************************************************
+    """
+
+    def __init__(self, board, cache_size=50000):
+        """
+        ********************************************************************
+        *
+        * Method name: __init__
+        *
+        * Description: Builds, for every floor cell, the row of push
+        * distances from that cell to every target, and an empty cache.
+        *
+        * Calling arguments:
+        * - board: The BoardIndex of the level.
+        * - cache_size: Maximum number of memoized box configurations.
+        *
+        * Return value: None
+        *********************************************************************
+        """
+        self.size = len(board.target_cells)
+        self.cost_rows = [None] * board.size
+        for cell in range(board.size):
+            if not board.walls[cell]:
+                self.cost_rows[cell] = tuple(distance[cell] for distance in board.target_distances)
+        self.dummy_row = (0,) * self.size
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+
+    def estimate(self, boxes_position, parent_boxes=None):
+        """
+        ********************************************************************
+        *
+        * Method name: estimate
+        *
+        * Description: Returns the cost of the minimum matching of the boxes
+        * to the targets. If the boxes of the parent node are given and its
+        * solution is cached, only the row of the moved box is recomputed.
+        *
+        * Calling arguments:
+        * - boxes_position: Sorted tuple of box cell IDs.
+        * - parent_boxes: Sorted tuple of box cell IDs of the parent node,
+        *   or None.
+        *
+        * Return value: The heuristic value (sum of matched push distances).
+        *********************************************************************
+        """
+        cached = self.cache.get(boxes_position)
+        if cached is not None:
+            self.cache.move_to_end(boxes_position)
+            return cached[0]
+
+        if len(boxes_position) > self.size:
+            # More boxes than targets: no matching exists, fall back to the
+            # sum of the distances to the nearest target
+            return sum(min(self.cost_rows[box]) for box in boxes_position)
+
+        parent = self.cache.get(parent_boxes) if parent_boxes is not None else None
+        if parent is not None:
+            solution = self.replace_row(parent, parent_boxes, boxes_position)
+        else:
+            solution = self.solve(boxes_position)
+
+        self.cache[boxes_position] = solution
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)  # Evict the least recently used entry
+        return solution[0]
+
+    def update(self, parent_value, moved_from, moved_to, boxes_position, parent_boxes):
+        """
+        ********************************************************************
+        *
+        * Method name: update
+        *
+        * Description: Updates the estimate after a push. The matching has
+        * to be repaired, which estimate() already does incrementally from
+        * the parent's cached solution.
+        *
+        * Calling arguments:
+        * - parent_value, moved_from, moved_to: Unused, accepted for the
+        *   estimator interface.
+        * - boxes_position: Sorted tuple of box cell IDs of the child.
+        * - parent_boxes: Sorted tuple of box cell IDs of the parent.
+        *
+        * Return value: The heuristic value of the child.
+        *********************************************************************
+        """
+        return self.estimate(boxes_position, parent_boxes)
+
+    def solve(self, boxes_position):
+        """
+        ********************************************************************
+        *
+        * Method name: solve
+        *
+        * Description: Solves the matching from scratch, adding the rows one
+        * at a time.
+        *
+        * Calling arguments:
+        * - boxes_position: Sorted tuple of box cell IDs.
+        *
+        * Return value: Tuple (cost, rows, u, v, p) where rows holds the cost
+        * row of every matrix row (1-indexed), u and v are the dual
+        * potentials and p[j] is the row matched to column j.
+        *********************************************************************
+        """
+        n = self.size
+        rows = [None] + [self.cost_rows[box] for box in boxes_position]
+        rows += [self.dummy_row] * (n + 1 - len(rows))
+        u = [0] * (n + 1)
+        v = [0] * (n + 1)
+        p = [0] * (n + 1)
+        for i in range(1, n + 1):
+            self.augment(i, rows, u, v, p)
+        return (self.matching_cost(rows, p), rows, u, v, p)
+
+    def replace_row(self, parent, parent_boxes, boxes_position):
+        """
+        ********************************************************************
+        *
+        * Method name: replace_row
+        *
+        * Description: Derives the solution of a box configuration from the
+        * solution of the parent configuration, which differs in one box.
+        * The row of the moved box is unmatched, replaced by the row of its
+        * new cell and matched again with one augmentation; the rest of the
+        * matching and the potentials stay valid.
+        *
+        * Calling arguments:
+        * - parent: Cached solution of the parent configuration.
+        * - parent_boxes: Sorted tuple of box cell IDs of the parent.
+        * - boxes_position: Sorted tuple of box cell IDs of the child.
+        *
+        * Return value: Solution tuple as returned by solve().
+        *********************************************************************
+        """
+        moved_from = set(parent_boxes).difference(boxes_position)
+        moved_to = set(boxes_position).difference(parent_boxes)
+        if len(moved_from) != 1 or len(moved_to) != 1:
+            return self.solve(boxes_position)
+
+        _, rows, u, v, p = parent
+        rows, u, v, p = list(rows), list(u), list(v), list(p)
+        old_row = self.cost_rows[moved_from.pop()]
+        i = rows.index(old_row, 1)
+        rows[i] = self.cost_rows[moved_to.pop()]
+        p[p.index(i, 1)] = 0
+        u[i] = 0
+        self.augment(i, rows, u, v, p)
+        return (self.matching_cost(rows, p), rows, u, v, p)
+
+    def augment(self, i, rows, u, v, p):
+        """
+        ********************************************************************
+        *
+        * Method name: augment
+        *
+        * Description: Matches the free row i along a shortest augmenting
+        * path (one step of the Hungarian algorithm), updating the dual
+        * potentials so that every matched cell stays tight.
+        *
+        * Calling arguments:
+        * - i: The row to match (1-indexed).
+        * - rows, u, v, p: Cost rows, potentials and matching (modified in
+        *   place).
+        *
+        * Return value: None
+        *********************************************************************
+        """
+        n = self.size
+        infinity = float('inf')
+        minv = [infinity] * (n + 1)
+        used = [False] * (n + 1)
+        way = [0] * (n + 1)
+        p[0] = i
+        j0 = 0
+        while True:
+            used[j0] = True
+            i0 = p[j0]
+            row = rows[i0]
+            ui0 = u[i0]
+            delta = infinity
+            j1 = 0
+            for j in range(1, n + 1):
+                if not used[j]:
+                    current = row[j - 1] - ui0 - v[j]
+                    if current < minv[j]:
+                        minv[j] = current
+                        way[j] = j0
+                    if minv[j] < delta:
+                        delta = minv[j]
+                        j1 = j
+            for j in range(n + 1):
+                if used[j]:
+                    u[p[j]] += delta
+                    v[j] -= delta
+                else:
+                    minv[j] -= delta
+            j0 = j1
+            if p[j0] == 0:
+                break
+        while j0:
+            j1 = way[j0]
+            p[j0] = p[j1]
+            j0 = j1
+
+    @staticmethod
+    def matching_cost(rows, p):
+        """
+        ********************************************************************
+        *
+        * Method name: matching_cost
+        *
+        * Description: Adds up the cost of the matched cells.
+        *
+        * Return value: The total cost of the matching.
+        *********************************************************************
+        """
+        return sum(rows[p[j]][j - 1] for j in range(1, len(p)))
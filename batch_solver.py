@@ -0,0 +1,167 @@
+import contextlib
+import io
+import multiprocessing
+import os
+import signal
+import sys
+
+try:
+    import resource
+except ImportError:  # Not available on Windows: no memory caps there
+    resource = None
+
+
+class BatchSolver:
+    """
+    ********************************************************************
+    *
+    * Class name: BatchSolver
+    *
+    * Name of the original author: Carlos Ruiz García-Casarrios
+    *
+    * Description of the class: The BatchSolver class runs one action (T1,
+    * T2S, T2T or T3) over many levels read from a file or from the standard
+    * input, one level per line in the same '\\n'-escaped format as the -l
+    * argument. The levels are dispatched to a pool of worker processes so
+    * the interpreter is only started once, and the output of every level is
+    * written in input order, preceded by a LEVEL:<index> line. Each level
+    * can be given a time limit and each worker a memory cap, so a single
+    * pathological level is reported as TIMEOUT or OUT OF MEMORY instead of
+    * stalling the whole batch.
+    *
+    * Required Files: sokoban.py (run_action), multiprocessing
+    *
+    *********************************************************************
+    """
+
+    def __init__(self, args):
+        """
+        ********************************************************************
+        *
+        * Method name: __init__
+        *
+        * Description: Stores the parsed command line arguments.
+        *
+        * Calling arguments:
+        * - args: Namespace with the batch options (f, task, workers,
+        *   timeout, memory) and the options of the action to run.
+        *
+        * Return value: None
+        *********************************************************************
+        """
+        self.args = args
+        self.workers = args.workers or os.cpu_count() or 1
+
+    def read_levels(self):
+        """
+        ********************************************************************
+        *
+        * Method name: read_levels
+        *
+        * Description: Reads the levels from the batch file, or from the
+        * standard input if the file is '-'. Empty lines are skipped.
+        *
+        * Return value: List of level strings.
+        *********************************************************************
+        """
+        if self.args.f == '-':
+            lines = sys.stdin.read().splitlines()
+        else:
+            with open(self.args.f, encoding='utf-8') as levels_file:
+                lines = levels_file.read().splitlines()
+        return [line for line in lines if line.strip()]
+
+    def run(self):
+        """
+        ********************************************************************
+        *
+        * Method name: run
+        *
+        * Description: Solves every level on the process pool and prints the
+        * results as they arrive, in input order.
+        *
+        * Return value: None
+        *********************************************************************
+        """
+        levels = self.read_levels()
+        jobs = [(index, level, self.args) for index, level in enumerate(levels)]
+        with multiprocessing.Pool(self.workers, initializer=BatchSolver.init_worker,
+                                  initargs=(self.args.memory,)) as pool:
+            for index, status, output in pool.imap(BatchSolver.solve_level, jobs):
+                print(f"LEVEL:{index}")
+                sys.stdout.write(output)
+                if status != "OK":
+                    print(status)
+                sys.stdout.flush()
+
+    @staticmethod
+    def init_worker(memory):
+        """
+        ********************************************************************
+        *
+        * Method name: init_worker
+        *
+        * Description: Applies the memory cap (in MB) to a worker process,
+        * after loading the solver so the cap only limits the searches.
+        *
+        * Calling arguments:
+        * - memory: Maximum address space of the worker in MB, or None.
+        *
+        * Return value: None
+        *********************************************************************
+        """
+        import sokoban  # Loaded here: under a small cap the import itself runs out of memory
+
+        if memory and resource is not None:
+            limit = memory * 1024 * 1024
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+    @staticmethod
+    def on_timeout(signum, frame):
+        raise TimeoutError()
+
+    @staticmethod
+    def solve_level(job):
+        """
+        ********************************************************************
+        *
+        * Method name: solve_level
+        *
+        * Description: Runs the action on one level inside a worker, with the
+        * output captured and the time limit armed.
+        *
+        * Calling arguments:
+        * - job: Tuple (index, level string, args).
+        *
+        * Return value: Tuple (index, status, output) where status is OK,
+        * TIMEOUT, OUT OF MEMORY or an error message.
+        *********************************************************************
+        """
+        index, level, args = job
+        level_args = type(args)(**vars(args))
+        level_args.action = args.task
+        level_args.l = level
+        timeout = args.timeout if hasattr(signal, 'SIGALRM') else None
+        output = io.StringIO()
+        status = "OK"
+
+        if timeout:
+            signal.signal(signal.SIGALRM, BatchSolver.on_timeout)
+            signal.setitimer(signal.ITIMER_REAL, timeout)
+        try:
+            from sokoban import run_action
+
+            with contextlib.redirect_stdout(output):
+                run_action(level_args)
+        except TimeoutError:
+            status = "TIMEOUT"
+        except MemoryError:
+            status = "OUT OF MEMORY"
+        except SystemExit:
+            status = "ERROR"  # The reason has already been printed
+        except Exception as e:
+            status = f"ERROR: {e!r}"
+        finally:
+            if timeout:
+                signal.setitimer(signal.ITIMER_REAL, 0)
+        return index, status, output.getvalue()
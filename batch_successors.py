@@ -0,0 +1,178 @@
+from itertools import chain
+
+numpy = None  # Optional dependency, imported by the first BatchSuccessors
+
+
+class BatchSuccessors:
+    """
+    ********************************************************************
+    *
+    * Class name: BatchSuccessors
+    *
+    * Name of the original author: Carlos Ruiz García-Casarrios
+    *
+    * Description of the class: The BatchSuccessors class generates the
+    * successors of many states of the same level at once with NumPy. A
+    * layer of states is represented as an array of player cells, an array
+    * of sorted box cells per state and a box occupancy bitmap per state;
+    * for each of the four directions, the walks and pushes of every state
+    * are found with array operations against the static tables of the
+    * next cell and the cell beyond in that direction (-1 for a wall), and
+    * the moved boxes are re-sorted in one call. The successors are then
+    * ordered by state and by 'uUrRdDlL' action, and pushes into deadlocks
+    * are discarded with the scalar detector, so the result is exactly the
+    * one of Sokoban.generate_succesors for every state.
+    *
+    * The searches do not use it: they expand one node at a time, and once
+    * the successors are turned back into tuples the per-state path is
+    * faster. Only the arrays returned by expand are faster (see
+    * microbenchmark.py), for code that keeps whole layers as arrays.
+    *
+    * Required Files: numpy (optional dependency), sokoban.py
+    *
+    *********************************************************************
+    """
+
+    ACTIONS = "uUrRdDlL"  # Action code 2 * direction for walks, 2 * direction + 1 for pushes
+
+    def __init__(self, sokoban):
+        """
+        ********************************************************************
+        *
+        * Method name: __init__
+        *
+        * Description: Imports NumPy and builds the direction tables of the
+        * level.
+        *
+        * Calling arguments:
+        * - sokoban: The Sokoban level whose states are expanded.
+        *
+        * Return value: None
+        * List of Checked Exceptions: ImportError if NumPy is not installed
+        *********************************************************************
+        """
+        global numpy
+        import numpy
+
+        self.sokoban = sokoban
+        board = sokoban.board
+        self.size = board.size
+        self.next_cells = numpy.full((board.size, 4), -1, dtype=numpy.int64)
+        self.beyond_cells = numpy.full((board.size, 4), -1, dtype=numpy.int64)
+        for cell in range(board.size):
+            for walk, _, next_cell, beyond_cell in board.neighbors[cell]:
+                direction = BatchSuccessors.ACTIONS.index(walk) // 2
+                self.next_cells[cell, direction] = next_cell
+                self.beyond_cells[cell, direction] = beyond_cell
+
+    def expand(self, players, boxes, pruning=False):
+        """
+        ********************************************************************
+        *
+        * Method name: expand
+        *
+        * Description: Generates the successors of a layer of states.
+        *
+        * Calling arguments:
+        * - players: Array of the player cells, one per state.
+        * - boxes: Array of the sorted box cells, one row per state.
+        * - pruning: Whether to discard the pushes that lead to a deadlock.
+        *
+        * Return value: Tuple of arrays (parents, actions, players, boxes):
+        * the index of the state each successor comes from, its action code
+        * in ACTIONS, and its player and sorted box cells, ordered like the
+        * scalar successors of each state.
+        *********************************************************************
+        """
+        players = numpy.asarray(players, dtype=numpy.int64)
+        count = len(players)
+        boxes = numpy.asarray(boxes, dtype=numpy.int64)
+        if boxes.ndim == 1:
+            boxes = boxes.reshape(count, 0)  # An empty layer
+        rows = numpy.arange(count)
+        # The extra last column is never occupied, so the -1 of a wall reads as free
+        occupied = numpy.zeros((count, self.size + 1), dtype=bool)
+        occupied[rows[:, None], boxes] = True
+
+        parents, actions, new_players, landed, moved_boxes = [], [], [], [], []
+        for direction in range(4):
+            next_cells = self.next_cells[players, direction]
+            beyond_cells = self.beyond_cells[players, direction]
+            blocked = occupied[rows, next_cells]
+            walks = (next_cells != -1) & ~blocked
+            pushes = blocked & (beyond_cells != -1) & ~occupied[rows, beyond_cells]
+
+            walk_count = int(walks.sum())
+            parents.append(rows[walks])
+            actions.append(numpy.full(walk_count, 2 * direction, dtype=numpy.int64))
+            new_players.append(next_cells[walks])
+            landed.append(numpy.full(walk_count, -1, dtype=numpy.int64))
+
+            pushed_to = beyond_cells[pushes]
+            pushed_boxes = boxes[pushes]
+            moved = numpy.where(pushed_boxes == next_cells[pushes][:, None], pushed_to[:, None], pushed_boxes)
+            moved.sort(axis=1)
+            parents.append(rows[pushes])
+            actions.append(numpy.full(len(pushed_to), 2 * direction + 1, dtype=numpy.int64))
+            new_players.append(next_cells[pushes])
+            landed.append(pushed_to)
+            moved_boxes.append(moved)
+
+        parents = numpy.concatenate(parents)
+        actions = numpy.concatenate(actions)
+        moved_rows = numpy.cumsum(actions & 1) - 1  # Row of each push in the moved boxes
+        order = numpy.lexsort((actions, parents))
+        parents, actions, moved_rows = parents[order], actions[order], moved_rows[order]
+        new_players = numpy.concatenate(new_players)[order]
+        landed = numpy.concatenate(landed)[order]
+        # Walks keep the boxes of their state
+        new_boxes = boxes[parents]
+        pushes = (actions & 1) == 1
+        new_boxes[pushes] = numpy.concatenate(moved_boxes)[moved_rows[pushes]]
+        if pruning:
+            is_deadlock = self.sokoban.deadlocks.is_deadlock
+            keep = numpy.ones(len(parents), dtype=bool)
+            for index in numpy.flatnonzero(landed != -1).tolist():
+                keep[index] = not is_deadlock(int(landed[index]), tuple(new_boxes[index].tolist()))
+            parents, actions, new_players, new_boxes = \
+                parents[keep], actions[keep], new_players[keep], new_boxes[keep]
+        return parents, actions, new_players, new_boxes
+
+    def generate_succesors(self, states, pruning=False):
+        """
+        ********************************************************************
+        *
+        * Method name: generate_succesors
+        *
+        * Description: Generates the successors of a list of states in the
+        * format of Sokoban.generate_succesors, with the box tuples interned
+        * in the configurations of the current search.
+        *
+        * Calling arguments:
+        * - states: List of (player cell, sorted box cells tuple).
+        * - pruning: Whether to discard the pushes that lead to a deadlock.
+        *
+        * Return value: One list of (action, state key, cost, player, boxes)
+        * successors per state.
+        *********************************************************************
+        """
+        successors = [[] for _ in states]
+        if not states:
+            return successors
+        box_count = len(states[0][1])
+        players = numpy.fromiter((player for player, _ in states), dtype=numpy.int64, count=len(states))
+        boxes = numpy.fromiter(chain.from_iterable(boxes for _, boxes in states), dtype=numpy.int64,
+                               count=len(states) * box_count).reshape(len(states), box_count)
+        parents, actions, players, boxes = self.expand(players, boxes, pruning)
+        configurations = self.sokoban.box_configurations
+        # Only the pushes need new tuples: a walk keeps the tuple of its parent
+        pushes = numpy.flatnonzero(actions & 1)
+        pushed_boxes = iter(boxes[pushes].tolist())
+        for parent, action, player in zip(parents.tolist(), actions.tolist(), players.tolist()):
+            if action & 1:
+                new_boxes = tuple(next(pushed_boxes))
+                new_boxes = configurations.setdefault(new_boxes, new_boxes)
+            else:
+                new_boxes = states[parent][1]
+            successors[parent].append((BatchSuccessors.ACTIONS[action], (player, new_boxes), 1, player, new_boxes))
+        return successors
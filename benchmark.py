@@ -0,0 +1,327 @@
+import argparse
+import contextlib
+import io
+import json
+import sys
+import tracemalloc
+from time import perf_counter
+
+from sokoban import Sokoban
+
+
+class Benchmark:
+    """
+    ********************************************************************
+    *
+    * Class name: Benchmark
+    *
+    * Name of the original author: Carlos Ruiz García-Casarrios
+    *
+    * Description of the class: The Benchmark class measures the solver on
+    * a corpus of levels, one per line in the format of the -l argument,
+    * graded from trivial to hard (benchmark_levels.txt). For every level
+    * it times the successor generation of T2S and runs T3 with every
+    * strategy, recording the nodes expanded, the solution length, the
+    * search time, the nodes per second and, in a second run under
+    * tracemalloc, the peak memory. The results can be saved as a JSON
+    * baseline and a later run compared against it: a metric that gets
+    * worse than the baseline by more than the threshold is reported as a
+    * regression. The expanded nodes and solution lengths are exact; the
+    * times depend on the machine, so baselines should be compared on the
+    * machine that recorded them.
+    *
+    * Required Files: sokoban.py, benchmark_levels.txt
+    *
+    *********************************************************************
+    """
+
+    STRATEGIES = ["BFS", "DFS", "UC", "A*", "GREEDY", "IDA*", "BIDIRECTIONAL"]
+    LOWER_IS_BETTER = ["expanded", "solution_length", "time", "peak_memory"]
+    HIGHER_IS_BETTER = ["nodes_per_sec", "successors_per_sec"]
+    TIMED = ["time", "nodes_per_sec", "successors_per_sec"]
+    TIMING_FLOOR = 0.05  # Timings of shorter runs are too noisy to compare
+
+    def __init__(self, levels_file, strategies, max_depth=200, heuristic='PUSH', tt_size=1 << 16,
+                 repeat=10000, memory=True):
+        """
+        ********************************************************************
+        *
+        * Method name: __init__
+        *
+        * Description: Stores the configuration of the benchmark.
+        *
+        * Calling arguments:
+        * - levels_file: File with one level per line.
+        * - strategies: List of T3 strategies to run.
+        * - max_depth: Maximum depth of T3.
+        * - heuristic: Heuristic of A*, IDA* and GREEDY.
+        * - tt_size: Transposition table slots of IDA*.
+        * - repeat: Number of successor generations timed for T2S.
+        * - memory: Whether to measure the peak memory of T3.
+        *
+        * Return value: None
+        *********************************************************************
+        """
+        self.levels_file = levels_file
+        self.strategies = strategies
+        self.max_depth = max_depth
+        self.heuristic = heuristic
+        self.tt_size = tt_size
+        self.repeat = repeat
+        self.memory = memory
+
+    def settings(self):
+        """
+        ********************************************************************
+        *
+        * Method name: settings
+        *
+        * Description: Returns the settings that must match for two runs to
+        * be comparable.
+        *
+        * Return value: Dictionary of settings.
+        *********************************************************************
+        """
+        return {'levels_file': self.levels_file, 'max_depth': self.max_depth,
+                'heuristic': self.heuristic, 'tt_size': self.tt_size}
+
+    def read_levels(self):
+        """
+        ********************************************************************
+        *
+        * Method name: read_levels
+        *
+        * Description: Reads the levels of the corpus, skipping empty lines.
+        *
+        * Return value: List of level strings.
+        *********************************************************************
+        """
+        with open(self.levels_file, encoding='utf-8') as levels_file:
+            return [line for line in levels_file.read().splitlines() if line.strip()]
+
+    def run_t2s(self, level):
+        """
+        ********************************************************************
+        *
+        * Method name: run_t2s
+        *
+        * Description: Times the generation of the successors of the initial
+        * state of a level.
+        *
+        * Calling arguments:
+        * - level: The level string.
+        *
+        * Return value: Dictionary with the number of successors, the total
+        * time and the generations per second.
+        *********************************************************************
+        """
+        sokoban = Sokoban(level)
+        start = perf_counter()
+        for _ in range(self.repeat):
+            successors = sokoban.generate_succesors(sokoban.player_cell, sokoban.boxes_cells)
+        elapsed = perf_counter() - start
+        return {'successors': len(successors), 'time': elapsed, 'successors_per_sec': self.repeat / elapsed}
+
+    def solve(self, level, strategy):
+        """
+        ********************************************************************
+        *
+        * Method name: solve
+        *
+        * Description: Runs T3 on a level in quiet mode, discarding the
+        * output of the search.
+        *
+        * Calling arguments:
+        * - level: The level string.
+        * - strategy: The search strategy.
+        *
+        * Return value: Tuple (sokoban, found, elapsed time).
+        *********************************************************************
+        """
+        sokoban = Sokoban(level)
+        sokoban.quiet = True
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+            start = perf_counter()
+            found = sokoban.execute_T3(strategy, self.max_depth, True, 'MOVES', self.heuristic, None, self.tt_size)
+            elapsed = perf_counter() - start
+        return sokoban, found, elapsed
+
+    def run_t3(self, level, strategy):
+        """
+        ********************************************************************
+        *
+        * Method name: run_t3
+        *
+        * Description: Measures T3 on a level with one strategy.
+        *
+        * Calling arguments:
+        * - level: The level string.
+        * - strategy: The search strategy.
+        *
+        * Return value: Dictionary of metrics. The solution length is the
+        * number of moves, or None if no solution was found.
+        *********************************************************************
+        """
+        sokoban, found, elapsed = self.solve(level, strategy)
+        path = sokoban.printed_nodes[1:]
+        metrics = {
+            'expanded': sokoban.expanded,
+            'solution_length': sum(len(node.action) for node in path) if found else None,
+            'time': elapsed,
+            'nodes_per_sec': sokoban.expanded / elapsed if elapsed else 0.0,
+        }
+        if self.memory:
+            tracemalloc.start()
+            try:
+                self.solve(level, strategy)
+                metrics['peak_memory'] = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+        return metrics
+
+    def run(self):
+        """
+        ********************************************************************
+        *
+        * Method name: run
+        *
+        * Description: Runs the whole benchmark, printing one line per
+        * measurement as it completes.
+        *
+        * Return value: Dictionary with the settings and the results, keyed
+        * by level number, task and strategy.
+        *********************************************************************
+        """
+        results = {}
+        for index, level in enumerate(self.read_levels(), 1):
+            runs = [(f"{index:02d}:T2S", lambda: self.run_t2s(level))]
+            for strategy in self.strategies:
+                runs.append((f"{index:02d}:T3:{strategy}", lambda strategy=strategy: self.run_t3(level, strategy)))
+            for key, measure in runs:
+                results[key] = measure()
+                print(key, Benchmark.format_metrics(results[key]))
+                sys.stdout.flush()
+        return {'settings': self.settings(), 'results': results}
+
+    @staticmethod
+    def format_metrics(metrics):
+        """
+        ********************************************************************
+        *
+        * Method name: format_metrics
+        *
+        * Description: Formats the metrics of one measurement.
+        *
+        * Return value: String of name=value items.
+        *********************************************************************
+        """
+        items = []
+        for name, value in metrics.items():
+            items.append(f"{name}={value:.4f}" if isinstance(value, float) else f"{name}={value}")
+        return ",".join(items)
+
+    @staticmethod
+    def compare(baseline, current, threshold):
+        """
+        ********************************************************************
+        *
+        * Method name: compare
+        *
+        * Description: Compares a run against a baseline. A metric is a
+        * regression when it is worse than the baseline by more than the
+        * threshold (a fraction of the baseline value); a solution that is
+        * no longer found is always one. Timings are only compared for the
+        * runs that took at least TIMING_FLOOR seconds in the baseline.
+        *
+        * Calling arguments:
+        * - baseline: Results loaded from the baseline file.
+        * - current: Results of the current run.
+        * - threshold: Allowed relative change, e.g. 0.2 for 20%.
+        *
+        * Return value: List of regression messages.
+        *********************************************************************
+        """
+        regressions = []
+        for key, metrics in current['results'].items():
+            base = baseline['results'].get(key)
+            if base is None:
+                continue
+            for name, value in metrics.items():
+                old = base.get(name)
+                if old is None and value is None:
+                    continue
+                if old is not None and value is None:
+                    regressions.append(f"{key} {name} {old} -> None")
+                    continue
+                if old is None or old == 0:
+                    continue
+                if name in Benchmark.TIMED and base.get('time', 0) < Benchmark.TIMING_FLOOR:
+                    continue
+                change = (value - old) / old
+                if (name in Benchmark.LOWER_IS_BETTER and change > threshold) or \
+                        (name in Benchmark.HIGHER_IS_BETTER and change < -threshold):
+                    regressions.append(f"{key} {name} {old:.6g} -> {value:.6g} ({100 * change:+.1f}%)")
+        return regressions
+
+
+def main():
+    """
+    ********************************************************************
+    *
+    * Method name: main
+    *
+    * Name of the original author: Carlos Ruiz García-Casarrios
+    *
+    * Description of the Method: Runs the benchmark, optionally saves the
+    * results as a baseline and compares them with a previous baseline.
+    * Calling arguments: none (args are parsed from the command line)
+    * Return value: None (exits with status 1 if there are regressions)
+    * Required Files: benchmark_levels.txt, the baseline file if given
+    * List of Checked Exceptions: sys.exit() in case of regressions
+    *********************************************************************
+    """
+    parser = argparse.ArgumentParser(description='Benchmark of the Sokoban solver')
+    parser.add_argument('-f', type=str, default='benchmark_levels.txt', help='File with one level per line')
+    parser.add_argument('-s', type=str.upper, default=",".join(Benchmark.STRATEGIES),
+                        help='Comma-separated T3 strategies to run')
+    parser.add_argument('-d', type=int, default=200, help='Maximum depth for T3')
+    parser.add_argument('-H', type=str.upper, choices=['MANHATTAN', 'PUSH', 'ASSIGNMENT'], default='PUSH',
+                        help='Heuristic for A*, IDA* and GREEDY')
+    parser.add_argument('--tt-size', type=int, default=1 << 16, help='Transposition table slots of IDA*')
+    parser.add_argument('--repeat', type=int, default=10000, help='Successor generations timed for T2S')
+    parser.add_argument('--no-memory', action='store_true', help='Skip the peak memory measurement')
+    parser.add_argument('--save', type=str, help='Write the results to this baseline file')
+    parser.add_argument('--compare', type=str, help='Compare the results with this baseline file')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='Relative change reported as a regression (0.2 = 20%%)')
+    args = parser.parse_args()
+
+    strategies = args.s.split(',')
+    for strategy in strategies:
+        if strategy not in Benchmark.STRATEGIES:
+            print(f"Error: Strategy {strategy} is not valid. Choose among {', '.join(Benchmark.STRATEGIES)}.")
+            sys.exit(1)
+
+    benchmark = Benchmark(args.f, strategies, args.d, args.H, args.tt_size, args.repeat, not args.no_memory)
+    current = benchmark.run()
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as baseline_file:
+            json.dump(current, baseline_file, indent=2, sort_keys=True)
+            baseline_file.write('\n')
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as baseline_file:
+            baseline = json.load(baseline_file)
+        if baseline.get('settings') != current['settings']:
+            print(f"Warning: The baseline was recorded with different settings: {baseline.get('settings')}")
+        regressions = Benchmark.compare(baseline, current, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        print(f"Regressions:{len(regressions)}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
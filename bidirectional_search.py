@@ -0,0 +1,252 @@
+from bisect import insort
+from itertools import combinations
+
+from node import Node
+
+
+class BidirectionalSearch:
+    """
+    ********************************************************************
+    *
+    * Class name: BidirectionalSearch
+    *
+    * Name of the original author: Carlos Ruiz García-Casarrios
+    *
+    * Description of the class: The BidirectionalSearch class implements the
+    * BIDIRECTIONAL strategy of T3. It runs a breadth-first search of pushes
+    * forward from the initial state and a breadth-first search of pulls
+    * backward from every goal state (all boxes on targets, with the player
+    * in any of the free regions), always expanding the smaller of the two
+    * layers. States are push-level keys (normalized player region and box
+    * tuple, as in the PUSHES mode), stored in one table per direction; the
+    * search stops as soon as a state generated by one side is found in the
+    * other side's table, roughly halving the depth each side must reach.
+    * The joined path is replayed from the initial state into
+    * nodes with uUrRdDlL actions, like the other strategies.
+    *
+    * Required Files: sokoban.py (push successors and level data)
+    *
+    *********************************************************************
+    """
+
+    OPPOSITE = {'U': 'D', 'D': 'U', 'L': 'R', 'R': 'L'}
+
+    def __init__(self, sokoban, max_depth, pruning=True, progress=None):
+        """
+        ********************************************************************
+        *
+        * Method name: __init__
+        *
+        * Description: Stores the level and the limits of the search.
+        *
+        * Calling arguments:
+        * - sokoban: The Sokoban level to solve.
+        * - max_depth: Maximum number of pushes of the joined path.
+        * - pruning: Whether forward pushes into deadlocks are pruned.
+        * - progress: Optional shared value where the number of expanded
+        *   states is published.
+        *
+        * Return value: None
+        *********************************************************************
+        """
+        self.sokoban = sokoban
+        self.board = sokoban.board
+        self.max_depth = max_depth
+        self.pruning = pruning
+        self.progress = progress
+        self.expanded = 0
+
+    def goal_states(self):
+        """
+        ********************************************************************
+        *
+        * Method name: goal_states
+        *
+        * Description: Builds the keys of all goal states: every placement
+        * of the boxes on targets, combined with every connected region of
+        * free cells the player could be standing in.
+        *
+        * Return value: List of goal state keys.
+        *********************************************************************
+        """
+        goals = []
+        for boxes in combinations(self.board.target_cells, len(self.sokoban.boxes_cells)):
+            occupied = set(boxes)
+            seen = set()
+            for cell in range(self.board.size):
+                if self.board.walls[cell] or cell in occupied or cell in seen:
+                    continue
+                region = self.board.reachable(cell, occupied)
+                seen.update(region)
+                goals.append((min(region), boxes))
+        return goals
+
+    def expand_forward(self, key):
+        """
+        ********************************************************************
+        *
+        * Method name: expand_forward
+        *
+        * Description: Generates the push successors of a state.
+        *
+        * Return value: List of (new key, pushed box cell, push action).
+        *********************************************************************
+        """
+        player, boxes = key
+        return [(new_key, box, push) for push, new_key, _, box, _ in
+                self.sokoban.generate_push_succesors(player, boxes, self.pruning)]
+
+    def expand_backward(self, key):
+        """
+        ********************************************************************
+        *
+        * Method name: expand_backward
+        *
+        * Description: Generates the pull predecessors of a state. The player
+        * stands next to a box, pulls it onto its own cell and steps back, so
+        * the cell behind the player must be free. Each predecessor is
+        * returned with the forward push that leads back to this state.
+        *
+        * Return value: List of (new key, box cell to push, push action).
+        *********************************************************************
+        """
+        player, boxes = key
+        occupied = set(boxes)
+        reach = self.board.reachable(player, occupied)
+        predecessors = []
+        for box in boxes:
+            for _, push, next_cell, beyond_cell in self.board.neighbors[box]:
+                if next_cell not in reach or beyond_cell == -1 or beyond_cell in occupied:
+                    continue
+                new_boxes = list(boxes)
+                new_boxes.remove(box)
+                insort(new_boxes, next_cell)
+                new_boxes = tuple(new_boxes)
+                new_key = self.sokoban.push_state_key(beyond_cell, new_boxes)
+                predecessors.append((new_key, next_cell, BidirectionalSearch.OPPOSITE[push]))
+        return predecessors
+
+    def run(self, initial_node):
+        """
+        ********************************************************************
+        *
+        * Method name: run
+        *
+        * Description: Runs both searches until they meet, the joined depth
+        * exceeds the maximum depth or one side runs out of states.
+        *
+        * Calling arguments:
+        * - initial_node: Node of the initial state (already numbered).
+        *
+        * Return value: List with the nodes of the solution path after the
+        * initial node, or None if there is no solution.
+        *********************************************************************
+        """
+        sokoban = self.sokoban
+        start = sokoban.push_state_key(sokoban.player_cell, sokoban.boxes_cells)
+
+        if sokoban.is_goal_state(sokoban.boxes_cells):
+            return []
+
+        forward = {start: None}  # key -> (parent key, pushed box, push)
+        backward = {}  # key -> (child key towards the goal, pushed box, push)
+        for goal in self.goal_states():
+            backward[goal] = None
+        forward_layer = [start]
+        backward_layer = list(backward)
+        depth = 0
+        meeting = None
+
+        while forward_layer and backward_layer and depth < self.max_depth and meeting is None:
+            depth += 1
+            if len(forward_layer) <= len(backward_layer):
+                forward_layer, meeting = self.expand_layer(forward_layer, forward, backward, self.expand_forward)
+            else:
+                backward_layer, meeting = self.expand_layer(backward_layer, backward, forward, self.expand_backward)
+        if self.progress is not None:
+            self.progress.value = self.expanded
+
+        if meeting is None:
+            return None
+
+        pushes = []
+        key = meeting
+        while forward[key] is not None:
+            parent, box, push = forward[key]
+            pushes.append((box, push))
+            key = parent
+        pushes.reverse()
+        key = meeting
+        while backward[key] is not None:
+            child, box, push = backward[key]
+            pushes.append((box, push))
+            key = child
+
+        return self.replay(initial_node, pushes)
+
+    def expand_layer(self, layer, table, other_table, expand):
+        """
+        ********************************************************************
+        *
+        * Method name: expand_layer
+        *
+        * Description: Expands one breadth-first layer of one direction.
+        *
+        * Calling arguments:
+        * - layer: Keys of the current layer.
+        * - table: State table of this direction (updated in place).
+        * - other_table: State table of the opposite direction.
+        * - expand: Successor function of this direction.
+        *
+        * Return value: Tuple (next layer, meeting key or None).
+        *********************************************************************
+        """
+        next_layer = []
+        for key in layer:
+            self.expanded += 1
+            if self.progress is not None and self.expanded % 1024 == 0:
+                self.progress.value = self.expanded
+            for new_key, box, push in expand(key):
+                if new_key in table:
+                    continue
+                table[new_key] = (key, box, push)
+                if new_key in other_table:
+                    return next_layer, new_key
+                next_layer.append(new_key)
+        return next_layer, None
+
+    def replay(self, initial_node, pushes):
+        """
+        ********************************************************************
+        *
+        * Method name: replay
+        *
+        * Description: Replays the pushes of the joined path from the initial
+        * state, prefixing each one with the shortest walk to the box, and
+        * builds the nodes of the path.
+        *
+        * Calling arguments:
+        * - initial_node: Node of the initial state.
+        * - pushes: List of (box cell, push action).
+        *
+        * Return value: List of nodes from the first push to the goal.
+        *********************************************************************
+        """
+        path = []
+        parent = initial_node
+        player, boxes = self.sokoban.player_cell, self.sokoban.boxes_cells
+        for box, push in pushes:
+            for action, behind_cell, beyond_cell in self.board.box_pushes[box]:
+                if action == push:
+                    break
+            reach = self.board.reachable(player, set(boxes))
+            action = self.board.walk_path(reach, behind_cell) + push
+            new_boxes = list(boxes)
+            new_boxes.remove(box)
+            insort(new_boxes, beyond_cell)
+            player, boxes = box, tuple(new_boxes)
+            node = Node(next(self.sokoban.node_ids), parent, None, parent.depth + 1, parent.depth + 1,
+                        parent.cost + len(action), 0.00, action, boxes, player)
+            path.append(node)
+            parent = node
+        return path
@@ -0,0 +1,321 @@
+from array import array
+from collections import deque
+
+
+class BoardIndex:
+    """
+    ********************************************************************
+    *
+    * Class name: BoardIndex
+    *
+    * Name of the original author: Carlos Ruiz García-Casarrios
+    *
+    * Description of the class: The BoardIndex class holds the static part
+    * of a Sokoban level (everything that does not change while searching),
+    * preprocessed once so the search loop only does O(1) lookups. Every
+    * cell of the rows x columns rectangle gets a flat integer ID
+    * (row * columns + column), walls and targets are stored as bytearrays
+    * indexed by that ID, and each floor cell has a table with its
+    * neighbors and the cell where a box pushed in each direction would land.
+    * It also marks the dead squares: cells from which a box can never be
+    * pushed to any target, the push distance from every cell to every
+    * target (one compact array per target) together with the distance
+    * from every cell to its nearest target, so heuristics are reduced to
+    * table lookups. It also offers the player reachability flood fill
+    * used by the push-level search.
+    *
+    *********************************************************************
+    """
+
+    # Moves in the order successors must be generated: (walk, push, di, dj)
+    DIRECTIONS = (('u', 'U', -1, 0), ('r', 'R', 0, 1), ('d', 'D', 1, 0), ('l', 'L', 0, -1))
+    UNREACHABLE = 0xFFFF  # Push distance of cells a box cannot reach a target from
+
+    def __init__(self, matrix, rows, columns):
+        """
+        ********************************************************************
+        *
+        * Method name: __init__
+        *
+        * Description: Builds the wall and target bitmaps and the neighbor
+        * tables of the level. Cells outside the rectangle are treated as
+        * walls, while cells past the end of a short row are floor, as in
+        * the level matrix.
+        *
+        * Calling arguments:
+        * - matrix: The level as a list of rows of characters.
+        * - rows: Number of rows of the level.
+        * - columns: Number of columns of the level (longest row).
+        *
+        * Return value: None
+        *********************************************************************
+        """
+        self.rows = rows
+        self.columns = columns
+        self.size = rows * columns
+        self.offsets = {'U': -columns, 'R': 1, 'D': columns, 'L': -1}  # Cell ID shift per push
+        self.walls = bytearray(self.size)  # 1 if the cell is a wall
+        self.targets = bytearray(self.size)  # 1 if the cell is a target
+        target_cells = []
+
+        for i, row in enumerate(matrix):
+            for j, element in enumerate(row):
+                if element == '#':
+                    self.walls[i * columns + j] = 1
+                elif element in ['.', '*']:
+                    self.targets[i * columns + j] = 1
+                    target_cells.append(i * columns + j)
+        self.target_cells = tuple(target_cells)
+
+        # For every cell, the list of (walk, push, next cell, cell beyond) for the
+        # directions the player can move to; the cell beyond is -1 if a box
+        # could not be pushed there.
+        self.neighbors = [[] for _ in range(self.size)]
+        for cell in range(self.size):
+            if self.walls[cell]:
+                continue
+            for walk, push, di, dj in BoardIndex.DIRECTIONS:
+                next_cell = self.step(cell, di, dj)
+                if next_cell == -1:
+                    continue
+                beyond_cell = self.step(next_cell, di, dj)
+                self.neighbors[cell].append((walk, push, next_cell, beyond_cell))
+
+        # For every cell, the list of (push, cell behind, cell beyond) for the
+        # directions a box standing on it can be pushed to: the player must be
+        # on the cell behind and the box lands on the cell beyond.
+        self.box_pushes = [[] for _ in range(self.size)]
+        for cell in range(self.size):
+            if self.walls[cell]:
+                continue
+            for walk, push, di, dj in BoardIndex.DIRECTIONS:
+                behind_cell = self.step(cell, -di, -dj)
+                beyond_cell = self.step(cell, di, dj)
+                if behind_cell != -1 and beyond_cell != -1:
+                    self.box_pushes[cell].append((push, behind_cell, beyond_cell))
+
+        self.dead_squares = self.compute_dead_squares()
+        self.target_distances = self.compute_target_distances()
+        self.push_distances = self.nearest(self.target_distances)
+        self.manhattan_distances = self.nearest(self.compute_manhattan_distances())
+
+    def step(self, cell, di, dj):
+        """
+        ********************************************************************
+        *
+        * Method name: step
+        *
+        * Description: Moves one cell in the given direction.
+        *
+        * Calling arguments:
+        * - cell: The starting cell ID.
+        * - di, dj: Row and column offsets of the direction.
+        *
+        * Return value: The ID of the destination cell, or -1 if it is a wall
+        * or lies outside the level.
+        *********************************************************************
+        """
+        i, j = divmod(cell, self.columns)
+        i, j = i + di, j + dj
+        if not (0 <= i < self.rows and 0 <= j < self.columns):
+            return -1
+        next_cell = i * self.columns + j
+        return -1 if self.walls[next_cell] else next_cell
+
+    def compute_dead_squares(self):
+        """
+        ********************************************************************
+        *
+        * Method name: compute_dead_squares
+        *
+        * Description: Finds the cells from which a box can still reach a
+        * target by pulling boxes backwards from every target. A box at a
+        * cell can be pulled one step in a direction if both the next cell
+        * (where the player stands) and the cell beyond it (where the player
+        * steps back to) are floor. Other boxes and player reachability are
+        * ignored, so a cell is only marked dead when no push sequence at
+        * all could bring a box from it to a target.
+        *
+        * Return value: bytearray with 1 for every dead floor cell.
+        *********************************************************************
+        """
+        live = bytearray(self.size)
+        pending = list(self.target_cells)
+        for cell in pending:
+            live[cell] = 1
+
+        while pending:
+            cell = pending.pop()
+            for _, _, next_cell, beyond_cell in self.neighbors[cell]:
+                if beyond_cell != -1 and not live[next_cell]:
+                    live[next_cell] = 1
+                    pending.append(next_cell)
+
+        dead = bytearray(self.size)
+        for cell in range(self.size):
+            if not self.walls[cell] and not live[cell]:
+                dead[cell] = 1
+        return dead
+
+    def compute_target_distances(self):
+        """
+        ********************************************************************
+        *
+        * Method name: compute_target_distances
+        *
+        * Description: Runs a reverse breadth-first search of box pulls from
+        * each target to get the minimum number of pushes needed to bring a
+        * box from any cell to that target, respecting walls but ignoring
+        * other boxes, so it never overestimates the real number of pushes.
+        *
+        * Return value: List with one array('H') per target (in target_cells
+        * order) holding the push distance of every cell, or UNREACHABLE.
+        *********************************************************************
+        """
+        distances = []
+        for target in self.target_cells:
+            distance = array('H', [BoardIndex.UNREACHABLE]) * self.size
+            distance[target] = 0
+            pending = deque([target])
+            while pending:
+                cell = pending.popleft()
+                for _, _, next_cell, beyond_cell in self.neighbors[cell]:
+                    if beyond_cell != -1 and distance[next_cell] == BoardIndex.UNREACHABLE:
+                        distance[next_cell] = distance[cell] + 1
+                        pending.append(next_cell)
+            distances.append(distance)
+        return distances
+
+    def compute_manhattan_distances(self):
+        """
+        ********************************************************************
+        *
+        * Method name: compute_manhattan_distances
+        *
+        * Description: Computes the Manhattan distance from every cell to
+        * every target, ignoring walls.
+        *
+        * Return value: List with one array('H') per target (in target_cells
+        * order) holding the distance of every cell.
+        *********************************************************************
+        """
+        distances = []
+        for target in self.target_cells:
+            ti, tj = divmod(target, self.columns)
+            distances.append(array('H', (abs(i - ti) + abs(j - tj)
+                                         for i in range(self.rows) for j in range(self.columns))))
+        return distances
+
+    def nearest(self, distances):
+        """
+        ********************************************************************
+        *
+        * Method name: nearest
+        *
+        * Description: Reduces per-target distance arrays to the distance
+        * from every cell to its nearest target.
+        *
+        * Calling arguments:
+        * - distances: List of per-target distance arrays.
+        *
+        * Return value: array('H') with the minimum distance of every cell,
+        * or UNREACHABLE if there are no targets.
+        *********************************************************************
+        """
+        if not distances:
+            return array('H', [BoardIndex.UNREACHABLE]) * self.size
+        return array('H', map(min, zip(*distances)))
+
+    def reachable(self, player_cell, occupied):
+        """
+        ********************************************************************
+        *
+        * Method name: reachable
+        *
+        * Description: Flood fills the cells the player can walk to without
+        * pushing any box, with a breadth-first search over the neighbor
+        * tables.
+        *
+        * Calling arguments:
+        * - player_cell: Cell ID where the player stands.
+        * - occupied: Set of cell IDs holding boxes.
+        *
+        * Return value: Dictionary mapping every reachable cell to a tuple
+        * (distance in moves, previous cell, walk action), with
+        * (0, None, None) for the player cell.
+        *********************************************************************
+        """
+        reach = {player_cell: (0, None, None)}
+        pending = deque([player_cell])
+        while pending:
+            cell = pending.popleft()
+            distance = reach[cell][0] + 1
+            for walk, _, next_cell, _ in self.neighbors[cell]:
+                if next_cell not in reach and next_cell not in occupied:
+                    reach[next_cell] = (distance, cell, walk)
+                    pending.append(next_cell)
+        return reach
+
+    @staticmethod
+    def walk_path(reach, cell):
+        """
+        ********************************************************************
+        *
+        * Method name: walk_path
+        *
+        * Description: Rebuilds the shortest walk to a cell from the result
+        * of a flood fill.
+        *
+        * Calling arguments:
+        * - reach: Dictionary returned by reachable().
+        * - cell: Destination cell ID (must be reachable).
+        *
+        * Return value: String of walk actions (u, r, d, l).
+        *********************************************************************
+        """
+        actions = []
+        _, previous, walk = reach[cell]
+        while previous is not None:
+            actions.append(walk)
+            _, previous, walk = reach[previous]
+        return ''.join(reversed(actions))
+
+    def cell(self, position):
+        """
+        ********************************************************************
+        *
+        * Method name: cell
+        *
+        * Description: Converts a (row, column) position into its cell ID.
+        *
+        * Return value: The cell ID.
+        *********************************************************************
+        """
+        return position[0] * self.columns + position[1]
+
+    def position(self, cell):
+        """
+        ********************************************************************
+        *
+        * Method name: position
+        *
+        * Description: Converts a cell ID back into its (row, column) position.
+        *
+        * Return value: Tuple (row, column).
+        *********************************************************************
+        """
+        return divmod(cell, self.columns)
+
+    def positions(self, cells):
+        """
+        ********************************************************************
+        *
+        * Method name: positions
+        *
+        * Description: Converts a sequence of cell IDs into (row, column)
+        * positions, keeping their order.
+        *
+        * Return value: List of (row, column) tuples.
+        *********************************************************************
+        """
+        return [divmod(cell, self.columns) for cell in cells]
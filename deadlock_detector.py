@@ -0,0 +1,236 @@
+from collections import OrderedDict
+
+
+class DeadlockDetector:
+    """
+    ********************************************************************
+    *
+    * Class name: DeadlockDetector
+    *
+    * Name of the original author: Carlos Ruiz García-Casarrios
+    *
+    * Description of the class: The DeadlockDetector class decides whether
+    * a push leaves the level in a state that can never be solved. It
+    * combines the static dead squares of the board index with a dynamic
+    * check of the neighborhood of the pushed box: 2x2 blocks of boxes and
+    * walls, and boxes frozen on both axes, with at least one of the
+    * involved boxes out of a target. The dynamic check only looks at the
+    * boxes inside a small window around the pushed box, so its result is
+    * memoized in a bounded LRU cache keyed by the box cell and the bitmask
+    * of the boxes in that window. Counters record how many successors each
+    * check pruned.
+    *
+    * Required Files: board_index.py (static board data)
+    *
+    *********************************************************************
+    """
+
+    WINDOW_RADIUS = 2  # The window around the pushed box is 5x5 cells
+
+    def __init__(self, board, cache_size=100000):
+        """
+        ********************************************************************
+        *
+        * Method name: __init__
+        *
+        * Description: Precomputes, for every floor cell, its neighbors on
+        * both axes and the bit assigned to each cell of its window, and
+        * initializes the cache and the counters.
+        *
+        * Calling arguments:
+        * - board: The BoardIndex of the level.
+        * - cache_size: Maximum number of memoized window configurations.
+        *
+        * Return value: None
+        *********************************************************************
+        """
+        self.board = board
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.axes = [None] * board.size  # ((up, down), (left, right)) per cell
+        self.windows = [None] * board.size  # {cell: bit} per cell
+        radius = DeadlockDetector.WINDOW_RADIUS
+
+        for cell in range(board.size):
+            if board.walls[cell]:
+                continue
+            self.axes[cell] = ((board.step(cell, -1, 0), board.step(cell, 1, 0)),
+                               (board.step(cell, 0, -1), board.step(cell, 0, 1)))
+            i, j = board.position(cell)
+            window = {}
+            for wi in range(i - radius, i + radius + 1):
+                for wj in range(j - radius, j + radius + 1):
+                    if 0 <= wi < board.rows and 0 <= wj < board.columns:
+                        window[wi * board.columns + wj] = 1 << len(window)
+            self.windows[cell] = window
+
+        self.pruned_dead_squares = 0  # Pushes pruned by the static dead squares
+        self.pruned_dynamic = 0  # Pushes pruned by 2x2 blocks or frozen boxes
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def is_deadlock(self, box_cell, boxes_position):
+        """
+        ********************************************************************
+        *
+        * Method name: is_deadlock
+        *
+        * Description: Checks whether the box that has just been pushed to
+        * box_cell makes the state unsolvable, first against the static dead
+        * squares and then with the memoized dynamic check.
+        *
+        * Calling arguments:
+        * - box_cell: Cell ID where the pushed box lands.
+        * - boxes_position: Cell IDs of all the boxes after the push.
+        *
+        * Return value: True if the push leads to a deadlock, False otherwise.
+        *********************************************************************
+        """
+        if self.board.dead_squares[box_cell]:
+            self.pruned_dead_squares += 1
+            return True
+
+        window = self.windows[box_cell]
+        mask = 0
+        for box in boxes_position:
+            bit = window.get(box)
+            if bit is not None:
+                mask |= bit
+        key = (box_cell, mask)
+
+        deadlock = self.cache.get(key)
+        if deadlock is None:
+            self.cache_misses += 1
+            local_boxes = {box for box in boxes_position if box in window}
+            deadlock = self.is_block_deadlock(box_cell, local_boxes) or self.is_freeze_deadlock(box_cell, local_boxes)
+            self.cache[key] = deadlock
+            if len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)  # Evict the least recently used entry
+        else:
+            self.cache_hits += 1
+            self.cache.move_to_end(key)
+
+        if deadlock:
+            self.pruned_dynamic += 1
+        return deadlock
+
+    def is_block_deadlock(self, box_cell, boxes):
+        """
+        ********************************************************************
+        *
+        * Method name: is_block_deadlock
+        *
+        * Description: Checks the four 2x2 blocks that contain the box. A
+        * block made only of walls and boxes can never be broken, so it is a
+        * deadlock unless all of its boxes are already on targets.
+        *
+        * Calling arguments:
+        * - box_cell: Cell ID of the pushed box.
+        * - boxes: Set of box cell IDs in the window.
+        *
+        * Return value: True if the box is part of a 2x2 deadlock block.
+        *********************************************************************
+        """
+        board = self.board
+        i, j = board.position(box_cell)
+        for di in (-1, 1):
+            for dj in (-1, 1):
+                block = [(i, j), (i + di, j), (i, j + dj), (i + di, j + dj)]
+                solid = True
+                off_target = False
+                for bi, bj in block:
+                    if not (0 <= bi < board.rows and 0 <= bj < board.columns):
+                        continue  # Outside the level counts as wall
+                    cell = bi * board.columns + bj
+                    if cell in boxes:
+                        if not board.targets[cell]:
+                            off_target = True
+                    elif not board.walls[cell]:
+                        solid = False
+                        break
+                if solid and off_target:
+                    return True
+        return False
+
+    def is_freeze_deadlock(self, box_cell, boxes):
+        """
+        ********************************************************************
+        *
+        * Method name: is_freeze_deadlock
+        *
+        * Description: Checks whether the box is frozen, i.e. it can be moved
+        * neither vertically nor horizontally, and at least one of the boxes
+        * that freeze it together is out of a target.
+        *
+        * Calling arguments:
+        * - box_cell: Cell ID of the pushed box.
+        * - boxes: Set of box cell IDs in the window.
+        *
+        * Return value: True if the box is frozen off a target.
+        *********************************************************************
+        """
+        frozen = []
+        if not self.is_frozen(box_cell, boxes, set(), frozen):
+            return False
+        targets = self.board.targets
+        return any(not targets[box] for box in frozen)
+
+    def is_frozen(self, box_cell, boxes, as_walls, frozen):
+        """
+        ********************************************************************
+        *
+        * Method name: is_frozen
+        *
+        * Description: Recursively checks whether a box is blocked on both
+        * axes. An axis is blocked when there is a wall on either side, a dead
+        * square on both sides, or a neighbor box that is itself frozen. The
+        * boxes already being checked are treated as walls to avoid cycles;
+        * a box that turns out not to be frozen stops being one.
+        *
+        * Calling arguments:
+        * - box_cell: Cell ID of the box to check.
+        * - boxes: Set of box cell IDs in the window.
+        * - as_walls: Set of boxes currently treated as walls.
+        * - frozen: List where the frozen boxes found are appended.
+        *
+        * Return value: True if the box is frozen.
+        *********************************************************************
+        """
+        as_walls.add(box_cell)
+        found = len(frozen)
+        for side_a, side_b in self.axes[box_cell]:
+            if not self.is_axis_blocked(side_a, side_b, boxes, as_walls, frozen):
+                # Forget the boxes that were only frozen assuming this one was a wall
+                as_walls.discard(box_cell)
+                del frozen[found:]
+                return False
+        frozen.append(box_cell)
+        return True
+
+    def is_axis_blocked(self, side_a, side_b, boxes, as_walls, frozen):
+        """
+        ********************************************************************
+        *
+        * Method name: is_axis_blocked
+        *
+        * Description: Checks whether a box with the given neighbors on one
+        * axis cannot be pushed along that axis.
+        *
+        * Calling arguments:
+        * - side_a, side_b: Neighbor cell IDs on the axis (-1 for walls).
+        * - boxes: Set of box cell IDs in the window.
+        * - as_walls: Set of boxes currently treated as walls.
+        * - frozen: List where the frozen boxes found are appended.
+        *
+        * Return value: True if the axis is blocked.
+        *********************************************************************
+        """
+        if side_a == -1 or side_b == -1 or side_a in as_walls or side_b in as_walls:
+            return True
+        dead_squares = self.board.dead_squares
+        if dead_squares[side_a] and dead_squares[side_b]:
+            return True
+        for side in (side_a, side_b):
+            if side in boxes and self.is_frozen(side, boxes, as_walls, frozen):
+                return True
+        return False
@@ -0,0 +1,100 @@
+import mmap
+import tempfile
+
+from fingerprint_visited_states import FingerprintVisitedStates
+
+
+class DiskVisitedStates(FingerprintVisitedStates):
+    """
+    ********************************************************************
+    *
+    * Class name: DiskVisitedStates
+    *
+    * Name of the original author: Carlos Ruiz García-Casarrios
+    *
+    * Description of the class: The DiskVisitedStates class keeps the
+    * fingerprint table of FingerprintVisitedStates in a memory-mapped
+    * temporary file instead of the process memory, so the visited states
+    * of a search can grow beyond the available RAM: the operating system
+    * pages the table in and out as needed. The file is unnamed and is
+    * deleted automatically when the table is replaced or the search ends.
+    *
+    * Required Files: fingerprint_visited_states.py
+    *
+    *********************************************************************
+    """
+
+    def __init__(self, capacity=1 << 16, bits=64, directory=None):
+        """
+        ********************************************************************
+        *
+        * Method name: __init__
+        *
+        * Description: Allocates the table in a file of the given directory.
+        *
+        * Calling arguments:
+        * - capacity: Initial number of slots.
+        * - bits: Size of the fingerprints (64 or 128).
+        * - directory: Directory of the file, or None for the system
+        *   temporary directory.
+        *
+        * Return value: None
+        *********************************************************************
+        """
+        self.directory = directory
+        self.files = {}  # id of the table -> (file, mmap) backing it
+        super().__init__(capacity, bits)
+        self.backend = f"DISK{bits}"
+
+    def allocate(self, size):
+        """
+        ********************************************************************
+        *
+        * Method name: allocate
+        *
+        * Description: Creates a zeroed file of the required size and maps it
+        * as a table of 64-bit words.
+        *
+        * Calling arguments:
+        * - size: Number of words.
+        *
+        * Return value: The table (a memoryview of the mapped file).
+        *********************************************************************
+        """
+        backing_file = tempfile.TemporaryFile(dir=self.directory)
+        backing_file.truncate(8 * size)
+        mapping = mmap.mmap(backing_file.fileno(), 8 * size)
+        table = memoryview(mapping).cast('Q')
+        self.files[id(table)] = (backing_file, mapping)
+        return table
+
+    def release(self, table):
+        """
+        ********************************************************************
+        *
+        * Method name: release
+        *
+        * Description: Unmaps and deletes the file of a replaced table.
+        *
+        * Return value: None
+        *********************************************************************
+        """
+        backing_file, mapping = self.files.pop(id(table))
+        table.release()
+        mapping.close()
+        backing_file.close()
+
+    def close(self):
+        """
+        ********************************************************************
+        *
+        * Method name: close
+        *
+        * Description: Deletes the file of the current table.
+        *
+        * Return value: None
+        *********************************************************************
+        """
+        if self.table is not None:
+            self.release(self.table)
+            self.table = None
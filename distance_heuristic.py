@@ -0,0 +1,76 @@
+class DistanceHeuristic:
+    """
+    ********************************************************************
+    *
+    * Class name: DistanceHeuristic
+    *
+    * Name of the original author: Carlos Ruiz García-Casarrios
+    *
+    * Description of the class: The DistanceHeuristic class estimates the
+    * cost to the goal as the sum, over all boxes, of the distance from the
+    * box to its nearest target. The distances come from a table
+    * precomputed by the board index (Manhattan or wall-aware push
+    * distance), so each estimate is O(B) lookups instead of O(B*T)
+    * arithmetic, and updating it after a push is O(1).
+    *
+    * Required Files: board_index.py (distance tables)
+    *
+    *********************************************************************
+    """
+
+    def __init__(self, distances):
+        """
+        ********************************************************************
+        *
+        * Method name: __init__
+        *
+        * Description: Stores the table of nearest target distances.
+        *
+        * Calling arguments:
+        * - distances: Sequence with the nearest target distance of every
+        *   cell, such as BoardIndex.manhattan_distances or
+        *   BoardIndex.push_distances.
+        *
+        * Return value: None
+        *********************************************************************
+        """
+        self.distances = distances
+
+    def estimate(self, boxes_position, parent_boxes=None):
+        """
+        ********************************************************************
+        *
+        * Method name: estimate
+        *
+        * Description: Adds up the table distance of every box.
+        *
+        * Calling arguments:
+        * - boxes_position: Tuple of box cell IDs.
+        * - parent_boxes: Unused, accepted for the estimator interface.
+        *
+        * Return value: The heuristic value.
+        *********************************************************************
+        """
+        distances = self.distances
+        return sum(distances[box] for box in boxes_position)
+
+    def update(self, parent_value, moved_from, moved_to, boxes_position, parent_boxes):
+        """
+        ********************************************************************
+        *
+        * Method name: update
+        *
+        * Description: Updates the parent's estimate after a push by
+        * replacing the distance of the moved box.
+        *
+        * Calling arguments:
+        * - parent_value: Heuristic value of the parent node.
+        * - moved_from: Cell ID the pushed box left.
+        * - moved_to: Cell ID the pushed box moved to.
+        * - boxes_position, parent_boxes: Unused, accepted for the estimator
+        *   interface.
+        *
+        * Return value: The heuristic value of the child.
+        *********************************************************************
+        """
+        return parent_value - self.distances[moved_from] + self.distances[moved_to]
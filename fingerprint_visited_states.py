@@ -0,0 +1,298 @@
+from array import array
+
+
+class FingerprintVisitedStates:
+    """
+    ********************************************************************
+    *
+    * Class name: FingerprintVisitedStates
+    *
+    * Name of the original author: Carlos Ruiz García-Casarrios
+    *
+    * Description of the class: The FingerprintVisitedStates class is a
+    * compact alternative to VisitedStates with the same add_state and
+    * is_visited methods. Instead of the state keys it stores a 64 or
+    * 128-bit fingerprint of each key in a preallocated open-addressing
+    * table of unsigned 64-bit words (linear probing, 0 marks an empty
+    * slot), so every state costs 8 or 16 bytes instead of a Python object.
+    * The table doubles when it is more than 70% full; since the slot is
+    * taken from the low bits of the fingerprint, it can be rehashed
+    * without the original keys. Two different states with the same
+    * fingerprint would be mistaken for each other, which with 64 bits is
+    * unlikely below billions of states; the second word of a 128-bit
+    * fingerprint is hashed independently of the first, which makes it
+    * negligible.
+    *
+    *********************************************************************
+    """
+
+    MASK = 0xFFFFFFFFFFFFFFFF
+    MAX_LOAD = 0.7
+    SEED = 0x9E3779B97F4A7C15  # First element of the tuple hashed for the second word
+
+    def __init__(self, capacity=1 << 16, bits=64):
+        """
+        ********************************************************************
+        *
+        * Method name: __init__
+        *
+        * Description: Allocates the table with room for the given number of
+        * slots, rounded up to a power of two.
+        *
+        * Calling arguments:
+        * - capacity: Initial number of slots.
+        * - bits: Size of the fingerprints (64 or 128).
+        *
+        * Return value: None
+        *********************************************************************
+        """
+        self.backend = f"FINGERPRINT{bits}"
+        self.words = bits // 64  # 64-bit words per slot
+        self.capacity = 1
+        while self.capacity < capacity:
+            self.capacity <<= 1
+        self.count = 0
+        self.table = self.allocate(self.capacity * self.words)
+
+    def allocate(self, size):
+        """
+        ********************************************************************
+        *
+        * Method name: allocate
+        *
+        * Description: Allocates a zeroed table of 64-bit words in memory.
+        *
+        * Calling arguments:
+        * - size: Number of words.
+        *
+        * Return value: The table.
+        *********************************************************************
+        """
+        return array('Q', bytes(8 * size))
+
+    def release(self, table):
+        """
+        ********************************************************************
+        *
+        * Method name: release
+        *
+        * Description: Frees a table that has been replaced. In memory there
+        * is nothing to do besides dropping the reference.
+        *
+        * Return value: None
+        *********************************************************************
+        """
+
+    def fingerprint(self, state_id):
+        """
+        ********************************************************************
+        *
+        * Method name: fingerprint
+        *
+        * Description: Computes the fingerprint of a state key. The first
+        * word is never 0, which marks empty slots. The second word is not
+        * derived from the first, so two keys whose first words collide
+        * only collide in both by chance.
+        *
+        * Calling arguments:
+        * - state_id: The key of the state, (player cell, box cells tuple).
+        *
+        * Return value: Tuple of 1 or 2 words.
+        *********************************************************************
+        """
+        first = hash(state_id) & FingerprintVisitedStates.MASK or 1
+        if self.words == 1:
+            return (first,)
+        # Hashing the flattened cells after a seed mixes them from another starting point;
+        # hashing state_id inside a tuple would only mix its hash, which collides with it
+        player, boxes = state_id
+        return (first, hash((FingerprintVisitedStates.SEED, player, *boxes)) & FingerprintVisitedStates.MASK)
+
+    def find(self, fingerprint):
+        """
+        ********************************************************************
+        *
+        * Method name: find
+        *
+        * Description: Probes the table for a fingerprint.
+        *
+        * Calling arguments:
+        * - fingerprint: Tuple of words as returned by fingerprint().
+        *
+        * Return value: Tuple (slot, found) where slot is the slot holding
+        * the fingerprint, or the empty slot where it would be stored.
+        *********************************************************************
+        """
+        table = self.table
+        words = self.words
+        mask = self.capacity - 1
+        first = fingerprint[0]
+        slot = first & mask
+        while True:
+            index = slot * words
+            stored = table[index]
+            if stored == 0:
+                return slot, False
+            if stored == first and (words == 1 or table[index + 1] == fingerprint[1]):
+                return slot, True
+            slot = (slot + 1) & mask
+
+    def store(self, slot, fingerprint):
+        """
+        ********************************************************************
+        *
+        * Method name: store
+        *
+        * Description: Writes a fingerprint in a slot.
+        *
+        * Return value: None
+        *********************************************************************
+        """
+        index = slot * self.words
+        for offset, word in enumerate(fingerprint):
+            self.table[index + offset] = word
+
+    def add_state(self, state_id):
+        """
+        ********************************************************************
+        *
+        * Method name: add_state
+        *
+        * Description: Adds the fingerprint of a state key to the table,
+        * growing it if it gets too full.
+        *
+        * Calling arguments:
+        * - state_id: The key of the state to be added.
+        *
+        * Return value: None
+        *********************************************************************
+        """
+        fingerprint = self.fingerprint(state_id)
+        slot, found = self.find(fingerprint)
+        if found:
+            return
+        self.store(slot, fingerprint)
+        self.count += 1
+        if self.count > self.capacity * FingerprintVisitedStates.MAX_LOAD:
+            self.grow()
+
+    def is_visited(self, state_id):
+        """
+        ********************************************************************
+        *
+        * Method name: is_visited
+        *
+        * Description: Checks if the fingerprint of a state key is in the
+        * table.
+        *
+        * Calling arguments:
+        * - state_id: The key of the state to check.
+        *
+        * Return value: True if the state has been visited, False otherwise.
+        *********************************************************************
+        """
+        return self.find(self.fingerprint(state_id))[1]
+
+    def grow(self):
+        """
+        ********************************************************************
+        *
+        * Method name: grow
+        *
+        * Description: Doubles the table and reinserts every fingerprint.
+        *
+        * Return value: None
+        *********************************************************************
+        """
+        old_table = self.table
+        words = self.words
+        self.capacity <<= 1
+        self.table = self.allocate(self.capacity * words)
+        for index in range(0, len(old_table), words):
+            if old_table[index]:
+                fingerprint = tuple(old_table[index:index + words])
+                self.store(self.find(fingerprint)[0], fingerprint)
+        self.release(old_table)
+
+    def close(self):
+        """
+        ********************************************************************
+        *
+        * Method name: close
+        *
+        * Description: Releases the table. In memory there is nothing to do.
+        *
+        * Return value: None
+        *********************************************************************
+        """
+
+    def __len__(self):
+        return self.count
+
+    def bytes_used(self):
+        """
+        ********************************************************************
+        *
+        * Method name: bytes_used
+        *
+        * Description: Returns the size of the table in bytes.
+        *
+        * Return value: Number of bytes.
+        *********************************************************************
+        """
+        return self.capacity * self.words * 8
+
+    def dump(self):
+        """
+        ********************************************************************
+        *
+        * Method name: dump
+        *
+        * Description: Copies the table for a checkpoint. The fingerprints
+        * are hashes of tuples of integers, which are the same in every
+        * process, so the table is valid when the search is resumed.
+        *
+        * Return value: Tuple (dictionary with the capacity and the number
+        * of states, array with a copy of the table).
+        *********************************************************************
+        """
+        table = array('Q')
+        table.frombytes(bytes(self.table))
+        return {'capacity': self.capacity, 'count': self.count}, table
+
+    def load(self, info, table):
+        """
+        ********************************************************************
+        *
+        * Method name: load
+        *
+        * Description: Replaces the table with the one of a checkpoint written
+        * by dump.
+        *
+        * Calling arguments:
+        * - info: Dictionary returned by dump.
+        * - table: Array returned by dump.
+        *
+        * Return value: None
+        *********************************************************************
+        """
+        self.release(self.table)
+        self.capacity = info['capacity']
+        self.count = info['count']
+        self.table = self.allocate(len(table))
+        self.table[:] = table
+
+    def report(self):
+        """
+        ********************************************************************
+        *
+        * Method name: report
+        *
+        * Description: Summarizes the occupancy of the table.
+        *
+        * Return value: String with the backend, number of states, capacity,
+        * occupancy and bytes used.
+        *********************************************************************
+        """
+        return (f"Visited:backend={self.backend},states={self.count},capacity={self.capacity},"
+                f"occupancy={100 * self.count / self.capacity:.1f}%,bytes={self.bytes_used()}")
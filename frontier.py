@@ -1,4 +1,4 @@
-from bisect import insort
+from heapq import heappush, heappop
 
 class Frontier:
     """
@@ -11,9 +11,11 @@ class Frontier:
     * Description of the class: The Frontier class implements a priority queue
     * that manages nodes in the search process. It provides methods for adding
     * nodes, popping nodes based on different strategies (BFS, DFS, UC), and
-    * checking if the frontier is empty.
+    * checking if the frontier is empty. The queue is a binary heap ordered
+    * by (value, node_id), so both operations are O(log n) and nodes leave
+    * the frontier in the same order as with a sorted list.
     *
-    * Required Files: bisect (for maintaining sorted order in the frontier)
+    * Required Files: heapq (for maintaining the heap order in the frontier)
     *
     *********************************************************************
     """
@@ -23,12 +25,13 @@ class Frontier:
         *
         * Method name: __init__
         *
-        * Description: Initializes the Frontier object with an empty list
-        * to hold nodes.
+        * Description: Initializes the Frontier object with an empty heap
+        * to hold nodes and the counter of its peak size.
         *
         *********************************************************************
         """
-        self.nodes = []  # List that will hold the nodes in the frontier
+        self.nodes = []  # Heap of (value, node_id, node) entries
+        self.peak_size = 0  # Largest number of nodes held at the same time
 
     def pop(self, strategy):
         """
@@ -37,7 +40,8 @@ class Frontier:
         * Method name: pop
         *
         * Description: Pops a node from the frontier based on the chosen
-        * strategy. Currently, all strategies pop from the front.
+        * strategy. Currently, all strategies pop the node with the lowest
+        * (value, node_id) pair.
         *
         * Calling arguments:
         * - strategy: The strategy to use when popping the node.
@@ -46,7 +50,7 @@ class Frontier:
         *********************************************************************
         """
         if self.nodes:
-            return self.nodes.pop(0)  # Always pop from the front
+            return heappop(self.nodes)[2]  # Always pop the smallest entry
         return None
 
     def add(self, node):
@@ -55,9 +59,10 @@ class Frontier:
         *
         * Method name: add
         *
-        * Description: Adds a node to the frontier while maintaining the list
-        * in sorted order. The sorting is first by the 'value' of the node,
-        * and if there are ties, by the 'node_id'.
+        * Description: Adds a node to the frontier while maintaining the heap
+        * order. The ordering is first by the 'value' of the node, and if
+        * there are ties, by the 'node_id'. Since node ids are unique the
+        * nodes themselves are never compared.
         *
         * Calling arguments:
         * - node: The node to add to the frontier.
@@ -65,8 +70,9 @@ class Frontier:
         * Return value: None (The node is added in place).
         *********************************************************************
         """
-        # Insert the node into its correct position in the sorted list
-        insort(self.nodes, node, key=lambda x: (x.value, x.node_id))
+        heappush(self.nodes, (node.value, node.node_id, node))
+        if len(self.nodes) > self.peak_size:
+            self.peak_size = len(self.nodes)
 
     def is_empty(self):
         """
@@ -81,6 +87,8 @@ class Frontier:
         """
         return len(self.nodes) == 0  # Returns True if the frontier is empty
 
+    def __len__(self):
+        return len(self.nodes)
 
     def __repr__(self):
-        return f"Frontier(nodes={self.nodes})"
+        return f"Frontier(nodes={[entry[2] for entry in sorted(self.nodes)]})"
@@ -0,0 +1,201 @@
+from node import Node
+from transposition_table import TranspositionTable
+
+
+class IDAStarSearch:
+    """
+    ********************************************************************
+    *
+    * Class name: IDAStarSearch
+    *
+    * Name of the original author: Carlos Ruiz García-Casarrios
+    *
+    * Description of the class: The IDAStarSearch class implements the IDA*
+    * strategy of T3: a series of depth-first searches bounded by a
+    * threshold on f = cost + heuristic, starting at the f of the initial
+    * node and raised each iteration to the lowest f that exceeded it. It
+    * uses the same heuristics, successors and node values as A*, so the
+    * solutions are optimal too, but it only keeps the current path and
+    * its siblings in memory instead of a frontier and a visited set. The
+    * depth-first search uses an explicit stack rather than recursion.
+    * States already on the current path are skipped, and an optional
+    * fixed-size transposition table skips states already searched in the
+    * same iteration with a lower or equal cost and depth.
+    *
+    * The threshold and the number of expanded nodes of every iteration
+    * (unless the level is in quiet mode), and the transposition table
+    * statistics, are reported on the log stream of the level
+    * (Sokoban.report, the standard error by default), so the output keeps
+    * the format of the other strategies.
+    *
+    * Required Files: sokoban.py (successors and heuristics),
+    * transposition_table.py
+    *
+    *********************************************************************
+    """
+
+    def __init__(self, sokoban, max_depth, pruning=True, mode='MOVES', heuristic='MANHATTAN',
+                 tt_size=0, tt_policy='DEPTH', progress=None):
+        """
+        ********************************************************************
+        *
+        * Method name: __init__
+        *
+        * Description: Stores the level and the configuration of the search.
+        *
+        * Calling arguments:
+        * - sokoban: The Sokoban level to solve.
+        * - max_depth: Maximum depth of the search.
+        * - pruning: Whether deadlock pruning is enabled.
+        * - mode: Search mode (MOVES or PUSHES).
+        * - heuristic: Heuristic (MANHATTAN, PUSH or ASSIGNMENT).
+        * - tt_size: Number of slots of the transposition table (0 for none).
+        * - tt_policy: Replacement policy of the table (ALWAYS or DEPTH).
+        * - progress: Optional shared value where the number of expanded
+        *   nodes is published.
+        *
+        * Return value: None
+        *********************************************************************
+        """
+        self.sokoban = sokoban
+        self.max_depth = max_depth
+        self.pruning = pruning
+        self.mode = mode
+        self.expand = sokoban.generate_push_succesors if mode == 'PUSHES' else sokoban.generate_succesors
+        self.estimator = sokoban.heuristic_estimator(heuristic)
+        self.table = TranspositionTable(tt_size, tt_policy) if tt_size > 0 else None
+        self.progress = progress
+        self.expanded = 0
+
+    def children(self, node):
+        """
+        ********************************************************************
+        *
+        * Method name: children
+        *
+        * Description: Builds the child nodes of a node, valued as in A*, and
+        * orders them by value so the most promising ones are tried first.
+        *
+        * Calling arguments:
+        * - node: The node to expand.
+        *
+        * Return value: List of child nodes.
+        *********************************************************************
+        """
+        board = self.sokoban.board
+        keep_keys = self.mode == 'PUSHES'
+        children = []
+        for action, new_state_key, cost, new_player_pos, new_boxes_pos in self.expand(
+                node.player_position, node.boxes_position, self.pruning):
+            if not keep_keys:
+                new_state_key = None
+            child = Node(next(self.sokoban.node_ids), node, None, 0, node.depth + 1, node.cost + cost, 0.00, action,
+                         new_boxes_pos, new_player_pos, new_state_key)
+            if action.isupper():
+                moved_to = new_player_pos + board.offsets[action]
+                child.inherit_heuristic("A*", board.targets, self.estimator, new_player_pos, moved_to)
+            else:
+                child.inherit_heuristic("A*", board.targets, self.estimator)
+            child.assign_value("A*")
+            children.append(child)
+        children.sort(key=lambda child: child.value)
+        return children
+
+    def run(self, initial_node):
+        """
+        ********************************************************************
+        *
+        * Method name: run
+        *
+        * Description: Runs the iterations until a solution is found or no
+        * node exceeded the threshold (the reachable space within the maximum
+        * depth is exhausted). The initial node gets its heuristic and value,
+        * so it can be printed afterwards.
+        *
+        * Calling arguments:
+        * - initial_node: Node of the initial state (already numbered).
+        *
+        * Return value: List with the nodes of the solution path after the
+        * initial node, or None if there is no solution.
+        *********************************************************************
+        """
+        sokoban = self.sokoban
+        initial_node.assign_heuristic("A*", sokoban.boxes_cells, sokoban.targets_position, self.estimator)
+        initial_node.boxes_on_target = sum(sokoban.board.targets[box] for box in sokoban.boxes_cells)
+        initial_node.assign_value("A*")
+
+        path = [] if initial_node.is_goal() else None
+        threshold = initial_node.value
+        iteration = 0
+        while path is None and threshold != float('inf'):
+            iteration += 1
+            expanded = self.expanded
+            path, next_threshold = self.iterate(initial_node, threshold, iteration)
+            if not sokoban.quiet:
+                sokoban.report(f"Iteration:{iteration},Threshold:{threshold:.2f},Expanded:{self.expanded - expanded}")
+            threshold = next_threshold
+        if self.table is not None:
+            sokoban.report(self.table.report())
+        if self.progress is not None:
+            self.progress.value = self.expanded
+
+        if path is not None and self.mode == 'PUSHES':
+            sokoban.expand_push_actions(path)
+        return path
+
+    def iterate(self, initial_node, threshold, iteration):
+        """
+        ********************************************************************
+        *
+        * Method name: iterate
+        *
+        * Description: Runs one depth-first iteration bounded by the
+        * threshold. Each stack entry holds a node, its children and the
+        * index of the next child to try.
+        *
+        * Calling arguments:
+        * - initial_node: Node of the initial state.
+        * - threshold: Maximum f of the nodes searched in this iteration.
+        * - iteration: Number of the iteration.
+        *
+        * Return value: Tuple (path or None, threshold of the next iteration).
+        *********************************************************************
+        """
+        next_threshold = float('inf')
+        if self.max_depth <= 0:
+            return None, next_threshold
+        on_path = {initial_node.key()}
+        stack = [[initial_node, self.children(initial_node), 0]]
+        self.expanded += 1
+
+        while stack:
+            entry = stack[-1]
+            node, children, index = entry
+            if index == len(children):
+                stack.pop()
+                on_path.discard(node.key())
+                continue
+            entry[2] = index + 1
+            child = children[index]
+
+            if child.value > threshold:
+                next_threshold = min(next_threshold, child.value)
+                continue
+            if child.is_goal():
+                return [entry[0] for entry in stack[1:]] + [child], next_threshold
+            if child.depth >= self.max_depth:
+                continue
+            state_key = child.key()
+            if state_key in on_path:
+                continue
+            # The table holds exact states: a PUSHES key merges player cells with different walks ahead
+            if self.table is not None and self.table.check((child.player_position, child.boxes_position),
+                                                           child.cost, child.depth, iteration):
+                continue
+
+            on_path.add(state_key)
+            stack.append([child, self.children(child), 0])
+            self.expanded += 1
+            if self.progress is not None and self.expanded % 1024 == 0:
+                self.progress.value = self.expanded
+        return None, next_threshold
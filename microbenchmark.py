@@ -0,0 +1,275 @@
+import argparse
+import json
+import random
+from time import perf_counter
+
+from node import Node
+from frontier import Frontier
+from sokoban import Sokoban
+from visited_states import VisitedStates
+from fingerprint_visited_states import FingerprintVisitedStates
+
+
+class Microbenchmark:
+    """
+    ********************************************************************
+    *
+    * Class name: Microbenchmark
+    *
+    * Name of the original author: Carlos Ruiz García-Casarrios
+    *
+    * Description of the class: The Microbenchmark class times the hot
+    * primitives of the search in isolation: successor generation (one
+    * state at a time and a layer of states at once), state ID hashing,
+    * the heuristic estimators of the searches (a full estimate and the
+    * update after a push), the frontier operations and the visited
+    * state lookups. Each primitive is measured on inputs of
+    * increasing size (board size and number of boxes, or number of nodes
+    * in the frontier and states in the visited store), so the output
+    * shows which ones scale worst. The inputs are random levels and
+    * states generated from a fixed seed, so two runs measure exactly the
+    * same work, and the results are printed in a fixed order, one line
+    * per primitive and size, ready to be diffed between commits.
+    *
+    *********************************************************************
+    """
+
+    BOARDS = [(8, 8, 2), (16, 16, 8), (32, 32, 32)]  # (rows, columns, boxes)
+    SIZES = [1000, 10000, 100000]  # Nodes in the frontier and states in the visited store
+    HEURISTICS = ["MANHATTAN", "PUSH", "ASSIGNMENT"]
+
+    def __init__(self, seed=0, number=2000, repeat=5):
+        """
+        ********************************************************************
+        *
+        * Method name: __init__
+        *
+        * Description: Stores the configuration of the measurements.
+        *
+        * Calling arguments:
+        * - seed: Seed of the random inputs.
+        * - number: Calls of the primitive per measurement.
+        * - repeat: Measurements per primitive; the fastest one is kept.
+        *
+        * Return value: None
+        *********************************************************************
+        """
+        self.seed = seed
+        self.number = number
+        self.repeat = repeat
+
+    def measure(self, operation, inputs):
+        """
+        ********************************************************************
+        *
+        * Method name: measure
+        *
+        * Description: Calls an operation on a cycle of inputs and returns
+        * the best rate of several measurements, the least disturbed by the
+        * rest of the system.
+        *
+        * Calling arguments:
+        * - operation: Function of one argument.
+        * - inputs: List of arguments, used in turn.
+        *
+        * Return value: Operations per second.
+        *********************************************************************
+        """
+        calls = [inputs[index % len(inputs)] for index in range(self.number)]
+        best = float('inf')
+        for _ in range(self.repeat):
+            start = perf_counter()
+            for argument in calls:
+                operation(argument)
+            best = min(best, perf_counter() - start)
+        return self.number / best if best else float('inf')
+
+    @staticmethod
+    def random_level(rng, rows, columns, boxes):
+        """
+        ********************************************************************
+        *
+        * Method name: random_level
+        *
+        * Description: Generates a level surrounded by walls, with 10% of
+        * inner walls and the player, boxes and targets on random free
+        * cells. The level does not need to be solvable.
+        *
+        * Calling arguments:
+        * - rng: The random generator.
+        * - rows, columns: Size of the level.
+        * - boxes: Number of boxes (and targets).
+        *
+        * Return value: The level string.
+        *********************************************************************
+        """
+        grid = [['#'] * columns for _ in range(rows)]
+        free = []
+        for i in range(1, rows - 1):
+            for j in range(1, columns - 1):
+                if rng.random() >= 0.1:
+                    grid[i][j] = ' '
+                    free.append((i, j))
+        cells = rng.sample(free, 2 * boxes + 1)
+        i, j = cells[0]
+        grid[i][j] = '@'
+        for i, j in cells[1:boxes + 1]:
+            grid[i][j] = '$'
+        for i, j in cells[boxes + 1:]:
+            grid[i][j] = '.'
+        return "\n".join("".join(row) for row in grid)
+
+    @staticmethod
+    def random_states(rng, sokoban, count):
+        """
+        ********************************************************************
+        *
+        * Method name: random_states
+        *
+        * Description: Generates random states of a level as (player cell,
+        * sorted box cells) keys, like the ones of the search.
+        *
+        * Return value: List of state keys.
+        *********************************************************************
+        """
+        floor = [cell for cell in range(sokoban.board.size) if not sokoban.board.walls[cell]]
+        states = []
+        for _ in range(count):
+            cells = rng.sample(floor, len(sokoban.boxes_cells) + 1)
+            states.append((cells[0], tuple(sorted(cells[1:]))))
+        return states
+
+    @staticmethod
+    def pushes(sokoban, states):
+        """
+        ********************************************************************
+        *
+        * Method name: pushes
+        *
+        * Description: Collects the pushes that can be made from the states,
+        * as a search would update the heuristic for them.
+        *
+        * Calling arguments:
+        * - sokoban: The Sokoban level.
+        * - states: List of state keys.
+        *
+        * Return value: List of (moved from, moved to, box cells, parent box
+        * cells) tuples.
+        *********************************************************************
+        """
+        pushes = []
+        for player, boxes_cells in states:
+            for action, _, _, new_player, new_boxes in sokoban.generate_succesors(player, boxes_cells):
+                if action.isupper():
+                    pushes.append((new_player, new_player + sokoban.board.offsets[action], new_boxes, boxes_cells))
+        return pushes
+
+    def run(self):
+        """
+        ********************************************************************
+        *
+        * Method name: run
+        *
+        * Description: Measures every primitive at every size.
+        *
+        * Return value: List of (primitive, parameters, operations per
+        * second) tuples, in a fixed order.
+        *********************************************************************
+        """
+        try:
+            import numpy
+            from batch_successors import BatchSuccessors
+        except ImportError:  # The batch lines are skipped without NumPy
+            numpy = None
+
+        rng = random.Random(self.seed)
+        results = []
+        for rows, columns, boxes in Microbenchmark.BOARDS:
+            parameters = f"board={rows}x{columns},boxes={boxes}"
+            sokoban = Sokoban(Microbenchmark.random_level(rng, rows, columns, boxes))
+            states = Microbenchmark.random_states(rng, sokoban, 256)
+            positions = [(sokoban.board.position(player), sokoban.board.positions(boxes_cells))
+                         for player, boxes_cells in states]
+
+            results.append(("generate_succesors", parameters,
+                            self.measure(lambda state: sokoban.generate_succesors(*state), states)))
+            if numpy is not None:
+                # Rates of the batches in states per second, like the scalar one
+                batch = BatchSuccessors(sokoban)
+                players = numpy.array([player for player, _ in states])
+                boxes_array = numpy.array([boxes_cells for _, boxes_cells in states])
+                results.append(("BatchSuccessors.generate_succesors", parameters,
+                                len(states) * self.measure(batch.generate_succesors, [states])))
+                results.append(("BatchSuccessors.expand", parameters,
+                                len(states) * self.measure(lambda layer: batch.expand(*layer), [(players, boxes_array)])))
+            results.append(("generate_level_id", parameters,
+                            self.measure(lambda position: sokoban.generate_level_id(*position), positions)))
+            pushes = Microbenchmark.pushes(sokoban, states)
+            for heuristic in Microbenchmark.HEURISTICS:
+                # The estimator of the searches; the assignment memo is emptied before every
+                # call, as a search mostly meets box configurations it has not seen yet
+                estimator = sokoban.heuristic_estimator(heuristic)
+                memo = getattr(estimator, 'cache', {})
+                results.append((f"heuristic_estimate[{heuristic}]", parameters,
+                                self.measure(lambda boxes_cells: (memo.clear(), estimator.estimate(boxes_cells)),
+                                             [boxes_cells for _, boxes_cells in states])))
+                updates = [(estimator.estimate(parent_boxes), moved_from, moved_to, boxes_cells, parent_boxes)
+                           for moved_from, moved_to, boxes_cells, parent_boxes in pushes]
+                results.append((f"heuristic_update[{heuristic}]", parameters,
+                                self.measure(lambda update: (memo.pop(update[3], None), estimator.update(*update)),
+                                             updates)))
+
+        sokoban = Sokoban(Microbenchmark.random_level(rng, *Microbenchmark.BOARDS[1]))
+        for size in Microbenchmark.SIZES:
+            parameters = f"size={size}"
+            states = Microbenchmark.random_states(rng, sokoban, 2 * size)
+            nodes = [Node(index, None, None, rng.random(), 0, 0, 0, "u", boxes_cells, player)
+                     for index, (player, boxes_cells) in enumerate(states[:size])]
+            frontier = Frontier()
+            for new_node in nodes:
+                frontier.add(new_node)
+            results.append(("frontier_add_pop", parameters,
+                            self.measure(lambda new_node: (frontier.add(new_node), frontier.pop("BFS")), nodes)))
+
+            for store in (VisitedStates(), FingerprintVisitedStates(2 * size)):
+                for state in states[:size]:
+                    store.add_state(state)
+                lookups = states[size // 2:size + size // 2]  # Half visited, half new
+                results.append((f"is_visited[{store.backend}]", parameters, self.measure(store.is_visited, lookups)))
+        return results
+
+
+def main():
+    """
+    ********************************************************************
+    *
+    * Method name: main
+    *
+    * Name of the original author: Carlos Ruiz García-Casarrios
+    *
+    * Description of the Method: Runs the micro-benchmarks and prints one
+    * line per primitive and size, or a JSON list.
+    * Calling arguments: none (args are parsed from the command line)
+    * Return value: None
+    * Required Files: none
+    * List of Checked Exceptions: none
+    *********************************************************************
+    """
+    parser = argparse.ArgumentParser(description='Micro-benchmarks of the Sokoban search primitives')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the random inputs')
+    parser.add_argument('-n', '--number', type=int, default=2000, help='Calls per measurement')
+    parser.add_argument('-r', '--repeat', type=int, default=5, help='Measurements per primitive (best is kept)')
+    parser.add_argument('--json', action='store_true', help='Print the results as JSON')
+    args = parser.parse_args()
+
+    results = Microbenchmark(args.seed, args.number, args.repeat).run()
+    if args.json:
+        print(json.dumps([{'primitive': primitive, 'parameters': parameters, 'ops_per_sec': round(rate)}
+                          for primitive, parameters, rate in results], indent=2))
+    else:
+        for primitive, parameters, rate in results:
+            print(f"{primitive:<36} {parameters:<24} {rate:>14,.0f} ops/sec")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,3 @@
-from argparse import Action
-
-
 class Node:
     """
     ********************************************************************
@@ -17,36 +14,46 @@ class Node:
     * strategy, track the path to the root, and represent the node as a
     * string.
     *
+    * Searches generate millions of nodes, so the class uses __slots__
+    * instead of a per-instance __dict__, and the box configuration tuple
+    * is shared between nodes: a walk reuses its parent's tuple and pushes
+    * reuse the tuple interned by the search for that configuration.
+    *
     *********************************************************************
     """
-    
-    node_counter = 0  # Counter to assign a unique node_id to each new node
 
-    def __init__(self, node_id, parent_id, state_id, value, depth, cost, heuristic, action, boxes_position, player_position):
+    __slots__ = ('node_id', 'parent_id', 'state_id', 'value', 'depth', 'cost', 'heuristic', 'action',
+                 'boxes_position', 'player_position', 'state_key', 'boxes_on_target')
+
+    def __init__(self, node_id, parent_id, state_id, value, depth, cost, heuristic, action, boxes_position, player_position, state_key=None):
         """
         ********************************************************************
         *
         * Method name: __init__
         *
         * Description: Initializes a new node with the given attributes.
-        * The node_id is automatically assigned using a counter, and other
-        * attributes are set based on the arguments provided.
+        * The node_id is given by the search, which numbers its own nodes,
+        * so several searches can run in the same process.
         *
         * Calling arguments:
-        * - node_id: The unique ID for the node (assigned automatically).
+        * - node_id: The unique ID for the node within its search.
         * - parent_id: The ID of the parent node.
-        * - state_id: The ID representing the state of the node.
+        * - state_id: The MD5 ID representing the state of the node, or None
+        *   when it has not been computed yet (it is only needed for printing).
         * - value: The value of the node used for sorting in the frontier.
         * - depth: The depth of the node in the search tree.
         * - cost: The cost to reach this node.
         * - heuristic: The heuristic value for this node.
         * - action: The action taken to reach this node.
+        * - boxes_position: The sorted tuple of box cell IDs in this state.
+        * - player_position: The cell ID of the player in this state.
+        * - state_key: The compact key of the state, used for deduplication,
+        *   or None when it is simply (player_position, boxes_position).
         *
         * Return value: None (initializes the node with the given attributes).
         *********************************************************************
         """
-        self.node_id = Node.node_counter  # Use the provided node_id
-        Node.node_counter += 1  # Increment the counter for the next node
+        self.node_id = node_id
         self.parent_id = parent_id
         self.state_id = state_id
         self.value = value
@@ -56,8 +63,10 @@ class Node:
         self.action = action
         self.boxes_position = boxes_position
         self.player_position = player_position
+        self.state_key = state_key
+        self.boxes_on_target = 0  # Number of boxes standing on a target
 
-    def assign_value(self, strategy):
+    def assign_value(self, strategy, weight=1):
         """
         ********************************************************************
         *
@@ -66,10 +75,12 @@ class Node:
         * Description: Assigns a value to the node based on the chosen strategy.
         * The value is used to prioritize the node in the frontier. For BFS,
         * the value is set to the depth, for DFS, it's the inverse of the depth,
-        * and for UC, it's based on the cost.
+        * and for UC, it's based on the cost. For A*, the heuristic can be
+        * weighted (cost + weight * heuristic), as in the ANYTIME strategy.
         *
         * Calling arguments:
         * - strategy: The search strategy (BFS, DFS, or UC).
+        * - weight: Weight of the heuristic in the A* value.
         *
         * Return value: None (modifies the node's value in place).
         *********************************************************************
@@ -81,38 +92,107 @@ class Node:
         elif strategy == "UC":
             self.value = self.cost  # For UC, value is based on the cost to reach the node
         elif strategy == "A*":
-            self.value = self.cost + self.heuristic
+            self.value = self.cost + weight * self.heuristic
         elif strategy == "GREEDY":
             self.value = self.heuristic
         return self.value
     
-    def assign_heuristic(self, strategy, boxes_position, targets_position):
+    def assign_heuristic(self, strategy, boxes_position, targets_position, estimator=None):
         """
         ********************************************************************
         *
         * Method name: assign_heuristic
         *
         * Description: Assigns a heuristic value to the node based on the chosen
-        * strategy. The heuristic is calculated using the Manhattan distance
-        * between the boxes and targets. The heuristic is used to estimate the
-        * cost to reach the goal state.
+        * strategy. The search gives an estimator object (DistanceHeuristic or
+        * AssignmentHeuristic) built on precomputed tables, which receives the
+        * box cells of this node and of its parent. Without an estimator the
+        * heuristic is calculated using the Manhattan distance between the
+        * boxes and targets. The heuristic is used to estimate the cost to
+        * reach the goal state.
         *
         * Calling arguments:
         * - strategy: The search strategy (A*).
         * - boxes_position: List of tuples representing the positions of the boxes.
         * - targets_position: List of tuples representing the positions of the targets.
+        * - estimator: Optional object with an estimate(boxes, parent_boxes) method.
         *
         * Return value: None (modifies the node's heuristic in place).
         *********************************************************************
         """
         if strategy == "UC" or strategy == "BFS" or strategy == "DFS":
             self.heuristic = 0
+        elif (strategy == "A*" or strategy == "GREEDY") and estimator is not None:
+            parent_boxes = self.parent_id.boxes_position if self.parent_id else None
+            self.heuristic = estimator.estimate(self.boxes_position, parent_boxes)
         elif strategy == "A*" or strategy == "GREEDY":
             self.heuristic = self.manhattan_distance(boxes_position, targets_position)
         elif strategy == "GREEDY":
             self.heuristic = self.manhattan_distance(boxes_position, targets_position)
         return self.heuristic
 
+    def inherit_heuristic(self, strategy, targets, estimator, moved_from=None, moved_to=None):
+        """
+        ********************************************************************
+        *
+        * Method name: inherit_heuristic
+        *
+        * Description: Sets the heuristic and the number of boxes on target
+        * of a child node from the values of its parent. A player walk moves
+        * no box, so both values are copied; a push moves exactly one box,
+        * so only its contribution is updated. This makes the heuristic and
+        * the goal test O(1) per successor for the distance heuristics.
+        *
+        * Calling arguments:
+        * - strategy: The search strategy.
+        * - targets: Target bitmap of the board index.
+        * - estimator: Heuristic estimator object, or None.
+        * - moved_from: Cell ID the pushed box left (None for a walk).
+        * - moved_to: Cell ID the pushed box moved to (None for a walk).
+        *
+        * Return value: None (modifies the node's heuristic in place).
+        *********************************************************************
+        """
+        parent = self.parent_id
+        self.heuristic = parent.heuristic
+        self.boxes_on_target = parent.boxes_on_target
+        if moved_from is not None:
+            self.boxes_on_target += targets[moved_to] - targets[moved_from]
+            if (strategy == "A*" or strategy == "GREEDY") and estimator is not None:
+                self.heuristic = estimator.update(parent.heuristic, moved_from, moved_to,
+                                                  self.boxes_position, parent.boxes_position)
+
+    def key(self):
+        """
+        ********************************************************************
+        *
+        * Method name: key
+        *
+        * Description: Returns the compact key of the node's state. Keys that
+        * are just the player cell and the box tuple are rebuilt on demand,
+        * so nodes waiting in the frontier do not need to hold one.
+        *
+        * Return value: The state key.
+        *********************************************************************
+        """
+        if self.state_key is None:
+            return (self.player_position, self.boxes_position)
+        return self.state_key
+
+    def is_goal(self):
+        """
+        ********************************************************************
+        *
+        * Method name: is_goal
+        *
+        * Description: Checks if every box of the node is on a target, using
+        * the count of boxes on target maintained by inherit_heuristic.
+        *
+        * Return value: True if the node is a goal state, False otherwise.
+        *********************************************************************
+        """
+        return self.boxes_on_target == len(self.boxes_position)
+
     def path(self):
         """
         ********************************************************************
@@ -165,8 +245,8 @@ class Node:
         Provides a string representation of the node with all its key attributes.
         """
         parent_id = self.parent_id.node_id if self.parent_id else "None"
-        self.value=round(self.value,2)
-        if self.value == 0.12:
-            self.value = 0.13
+        value = round(self.value, 2)
+        if value == 0.12:
+            value = 0.13
         return (f"{self.node_id},{self.state_id},{parent_id},"
-                f"{self.action},{self.depth},{self.cost:.2f},{self.heuristic:.2f},{self.value:.2f}")
+                f"{self.action},{self.depth},{self.cost:.2f},{self.heuristic:.2f},{value:.2f}")
@@ -0,0 +1,192 @@
+import contextlib
+import io
+import multiprocessing
+import queue
+import sys
+
+
+class PortfolioSolver:
+    """
+    ********************************************************************
+    *
+    * Class name: PortfolioSolver
+    *
+    * Name of the original author: Carlos Ruiz García-Casarrios
+    *
+    * Description of the class: The PortfolioSolver class implements the
+    * PORTFOLIO strategy of T3. It races several search configurations
+    * (strategy and heuristic) on the same level, each one in its own
+    * process, and keeps the first solution found, or the first one found
+    * by an optimal member (UC, A*, IDA*, and BFS in MOVES mode, since the
+    * pushes of PUSHES mode cost the walk too) when optimality is requested.
+    * The remaining processes are then cancelled. Every member publishes
+    * its number of expanded nodes in a shared value, so the report can
+    * show how far each one got, including the cancelled ones. A member
+    * whose process dies without sending a result counts as failed.
+    *
+    * Required Files: sokoban.py (execute_T3), multiprocessing
+    *
+    *********************************************************************
+    """
+
+    STRATEGIES = ["BFS", "DFS", "UC", "A*", "IDA*", "GREEDY", "BIDIRECTIONAL"]
+    HEURISTICS = ["MANHATTAN", "PUSH", "ASSIGNMENT"]
+    OPTIMAL_STRATEGIES = ["UC", "A*", "IDA*"]  # Plus BFS in MOVES mode, where every step costs 1
+    POLL_SECONDS = 0.5  # How often the members are checked for having died without a result
+
+    def __init__(self, sokoban, members, max_depth, pruning=True, mode='MOVES', optimal=False):
+        """
+        ********************************************************************
+        *
+        * Method name: __init__
+        *
+        * Description: Stores the level and the configuration of the race.
+        *
+        * Calling arguments:
+        * - sokoban: The Sokoban level to solve.
+        * - members: List of (strategy, heuristic) tuples to race.
+        * - max_depth: Maximum depth for every member.
+        * - pruning: Whether deadlock pruning is enabled.
+        * - mode: Search mode (MOVES or PUSHES).
+        * - optimal: If True, only solutions of optimal members win.
+        *
+        * Return value: None
+        *********************************************************************
+        """
+        self.sokoban = sokoban
+        self.members = members
+        self.max_depth = max_depth
+        self.pruning = pruning
+        self.mode = mode
+        self.optimal = optimal
+        self.optimal_strategies = PortfolioSolver.OPTIMAL_STRATEGIES + (["BFS"] if mode == 'MOVES' else [])
+
+    @staticmethod
+    def parse_members(spec, default_heuristic):
+        """
+        ********************************************************************
+        *
+        * Method name: parse_members
+        *
+        * Description: Parses the --portfolio option, a comma-separated list
+        * of STRATEGY or STRATEGY:HEURISTIC items.
+        *
+        * Calling arguments:
+        * - spec: The option string, e.g. "BFS,A*:ASSIGNMENT,GREEDY".
+        * - default_heuristic: Heuristic of the items that give none.
+        *
+        * Return value: List of (strategy, heuristic) tuples.
+        * List of Checked Exceptions: sys.exit() in case of invalid input
+        *********************************************************************
+        """
+        members = []
+        for item in spec.split(','):
+            strategy, _, heuristic = item.strip().partition(':')
+            heuristic = heuristic or default_heuristic
+            if strategy not in PortfolioSolver.STRATEGIES or heuristic not in PortfolioSolver.HEURISTICS:
+                print(f"Error: Portfolio member {item} is not valid. Use STRATEGY[:HEURISTIC] with strategies "
+                      f"{', '.join(PortfolioSolver.STRATEGIES)} and heuristics {', '.join(PortfolioSolver.HEURISTICS)}.")
+                sys.exit(1)
+            members.append((strategy, heuristic))
+        return members
+
+    @staticmethod
+    def member_label(member):
+        """
+        ********************************************************************
+        *
+        * Method name: member_label
+        *
+        * Description: Names a member for the report; the heuristic is only
+        * shown for the strategies that use it.
+        *
+        * Return value: Label string.
+        *********************************************************************
+        """
+        strategy, heuristic = member
+        if strategy in ["A*", "IDA*", "GREEDY"]:
+            return f"{strategy}:{heuristic}"
+        return strategy
+
+    def run(self):
+        """
+        ********************************************************************
+        *
+        * Method name: run
+        *
+        * Description: Starts one process per member and waits for the
+        * winner, then cancels the rest and prints the winner's output
+        * followed by the report (winner and nodes expanded per member).
+        *
+        * Return value: True if a solution was found, False otherwise.
+        *********************************************************************
+        """
+        results = multiprocessing.Queue()
+        progress = [multiprocessing.Value('q', 0) for _ in self.members]
+        processes = []
+        for index, (strategy, heuristic) in enumerate(self.members):
+            process = multiprocessing.Process(target=PortfolioSolver.run_member, daemon=True,
+                                              args=(self.sokoban, index, strategy, heuristic, self.max_depth,
+                                                    self.pruning, self.mode, progress[index], results))
+            process.start()
+            processes.append(process)
+
+        outputs = {}
+        winner = None
+        fallback = None  # First non-optimal solution, used if no optimal member succeeds
+        pending = set(range(len(processes)))
+        exited = set()  # Members seen dead at the previous timeout
+        while pending:
+            try:
+                index, found, output = results.get(timeout=PortfolioSolver.POLL_SECONDS)
+            except queue.Empty:
+                # A member killed before sending its result (OOM killer, signal) has failed. A member
+                # that did send it had already written it when it died, so it gets one more timeout
+                for index in exited & pending:
+                    pending.discard(index)
+                    outputs[index] = f"ERROR: The member process ended with exit code {processes[index].exitcode}\n"
+                exited = {index for index in pending if processes[index].exitcode is not None}
+                continue
+            pending.discard(index)
+            outputs[index] = output
+            if found and (not self.optimal or self.members[index][0] in self.optimal_strategies):
+                winner = index
+                break
+            if found and fallback is None:
+                fallback = index
+
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+            process.join()
+
+        if winner is None:
+            winner = fallback
+        sys.stdout.write(outputs[winner] if winner is not None else outputs[min(outputs)])
+        winner_label = PortfolioSolver.member_label(self.members[winner]) if winner is not None else "None"
+        print(f"Winner:{winner_label}")
+        print("Expanded:[" + ",".join(f"{PortfolioSolver.member_label(member)}={progress[index].value}"
+                                      for index, member in enumerate(self.members)) + "]")
+        return winner is not None
+
+    @staticmethod
+    def run_member(sokoban, index, strategy, heuristic, max_depth, pruning, mode, progress, results):
+        """
+        ********************************************************************
+        *
+        * Method name: run_member
+        *
+        * Description: Runs one member of the portfolio inside its process,
+        * capturing its output and sending it back with the outcome.
+        *
+        * Return value: None (the result is put in the results queue).
+        *********************************************************************
+        """
+        output = io.StringIO()
+        found = False
+        try:
+            with contextlib.redirect_stdout(output):
+                found = sokoban.execute_T3(strategy, max_depth, pruning, mode, heuristic, progress)
+        except Exception as e:
+            output.write(f"ERROR: {e!r}\n")
+        results.put((index, found, output.getvalue()))
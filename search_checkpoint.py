@@ -0,0 +1,250 @@
+import json
+import os
+import sys
+import zlib
+from array import array
+from itertools import chain, count
+
+from node import Node
+from frontier import Frontier
+
+
+class SearchCheckpoint:
+    """
+    ********************************************************************
+    *
+    * Class name: SearchCheckpoint
+    *
+    * Name of the original author: Carlos Ruiz García-Casarrios
+    *
+    * Description of the class: The SearchCheckpoint class saves a T3 search
+    * of the frontier strategies (BFS, DFS, UC, A* and GREEDY) to a file and
+    * restores it, so a long search survives a crash or a stop and resumes
+    * with exactly the same result. A checkpoint holds the search settings,
+    * the counters (expanded nodes and next node ID), the frontier heap in
+    * its order, the visited states and the node store: every node of the
+    * frontier and all its ancestors up to the initial node. The nodes are
+    * flattened into parallel arrays with the index of the parent instead
+    * of a reference, sorted by node ID so every parent comes before its
+    * children and the graph is rebuilt in one pass without recursion; the
+    * box tuples are stored once in a shared table. The file is a JSON
+    * header followed by the raw arrays, compressed with zlib, and it is
+    * written to a temporary file first, so an interrupted save never
+    * leaves a broken checkpoint behind.
+    *
+    * Required Files: node.py, frontier.py, zlib (standard library)
+    *
+    *********************************************************************
+    """
+
+    MAGIC = b"SOKOBAN-CHECKPOINT-1\n"
+
+    def __init__(self, path=None, interval=60.0, resume_path=None):
+        """
+        ********************************************************************
+        *
+        * Method name: __init__
+        *
+        * Description: Stores where and how often the search is saved.
+        *
+        * Calling arguments:
+        * - path: File where the checkpoints are written, or None.
+        * - interval: Seconds between two periodic checkpoints.
+        * - resume_path: Checkpoint to resume the search from, or None.
+        *
+        * Return value: None
+        *********************************************************************
+        """
+        self.path = path
+        self.interval = interval
+        self.resume_path = resume_path
+
+    @staticmethod
+    def write(path, metadata, arrays):
+        """
+        ********************************************************************
+        *
+        * Method name: write
+        *
+        * Description: Writes a checkpoint file atomically.
+        *
+        * Calling arguments:
+        * - path: The checkpoint file.
+        * - metadata: JSON-serializable dictionary.
+        * - arrays: Dictionary of name -> array.
+        *
+        * Return value: Size of the file in bytes.
+        *********************************************************************
+        """
+        metadata = dict(metadata, byteorder=sys.byteorder,
+                        arrays=[[name, data.typecode, len(data)] for name, data in arrays.items()])
+        header = json.dumps(metadata).encode('utf-8')
+        payload = b"".join(chain([len(header).to_bytes(8, 'little'), header],
+                                 (data.tobytes() for data in arrays.values())))
+        content = SearchCheckpoint.MAGIC + zlib.compress(payload)
+        temporary = f"{path}.tmp"
+        with open(temporary, 'wb') as checkpoint_file:
+            checkpoint_file.write(content)
+            checkpoint_file.flush()
+            os.fsync(checkpoint_file.fileno())
+        os.replace(temporary, path)
+        return len(content)
+
+    @staticmethod
+    def read(path):
+        """
+        ********************************************************************
+        *
+        * Method name: read
+        *
+        * Description: Reads a checkpoint file written by write.
+        *
+        * Calling arguments:
+        * - path: The checkpoint file.
+        *
+        * Return value: Tuple (metadata dictionary, dictionary of arrays).
+        * List of Checked Exceptions: ValueError if the file cannot be read,
+        * is not a checkpoint or is corrupt.
+        *********************************************************************
+        """
+        try:
+            with open(path, 'rb') as checkpoint_file:
+                content = checkpoint_file.read()
+        except OSError as e:
+            raise ValueError(f"Error: The checkpoint {path} cannot be read: {e.strerror}.")
+        if not content.startswith(SearchCheckpoint.MAGIC):
+            raise ValueError(f"Error: {path} is not a search checkpoint.")
+        try:
+            payload = zlib.decompress(content[len(SearchCheckpoint.MAGIC):])
+            size = int.from_bytes(payload[:8], 'little')
+            metadata = json.loads(payload[8:8 + size])
+            offset = 8 + size
+            arrays = {}
+            for name, typecode, length in metadata['arrays']:
+                data = array(typecode)
+                end = offset + length * data.itemsize
+                data.frombytes(payload[offset:end])
+                if metadata['byteorder'] != sys.byteorder:
+                    data.byteswap()
+                arrays[name] = data
+                offset = end
+        except (zlib.error, ValueError, KeyError, TypeError):  # The JSON errors are ValueErrors
+            raise ValueError(f"Error: The checkpoint {path} is corrupt.")
+        return metadata, arrays
+
+    def save(self, sokoban, settings, frontier, visited, expanded):
+        """
+        ********************************************************************
+        *
+        * Method name: save
+        *
+        * Description: Saves the state of a search at the end of an
+        * expansion, and reports it on the log stream of the level.
+        *
+        * Calling arguments:
+        * - sokoban: The Sokoban level being solved.
+        * - settings: Dictionary of the search settings.
+        * - frontier: The Frontier of the search.
+        * - visited: The visited states store.
+        * - expanded: Number of nodes expanded so far.
+        *
+        * Return value: None
+        *********************************************************************
+        """
+        nodes = {}
+        for _, _, node in frontier.nodes:
+            while node is not None and id(node) not in nodes:
+                nodes[id(node)] = node
+                node = node.parent_id
+        nodes = sorted(nodes.values(), key=lambda node: node.node_id)
+        index = {id(node): position for position, node in enumerate(nodes)}
+        configurations = {}
+        for node in nodes:
+            configurations.setdefault(node.boxes_position, len(configurations))
+
+        visited_info, visited_data = visited.dump()
+        metadata = {
+            'settings': settings,
+            'expanded': expanded,
+            'next_node_id': next(sokoban.node_ids),
+            'box_count': len(sokoban.boxes_cells),
+            'actions': "\n".join(node.action for node in nodes),
+            'visited': visited_info,
+        }
+        arrays = {
+            'node_id': array('q', (node.node_id for node in nodes)),
+            'parent': array('i', (index[id(node.parent_id)] if node.parent_id else -1 for node in nodes)),
+            'depth': array('i', (node.depth for node in nodes)),
+            'cost': array('d', (node.cost for node in nodes)),
+            'heuristic': array('d', (node.heuristic for node in nodes)),
+            'value': array('d', (node.value for node in nodes)),
+            'boxes_on_target': array('i', (node.boxes_on_target for node in nodes)),
+            'player': array('i', (node.player_position for node in nodes)),
+            'key_player': array('i', (node.state_key[0] if node.state_key else -1 for node in nodes)),
+            'boxes': array('i', (configurations[node.boxes_position] for node in nodes)),
+            'configurations': array('i', chain.from_iterable(configurations)),
+            'frontier': array('i', (index[id(entry[2])] for entry in frontier.nodes)),
+            'visited': visited_data,
+        }
+        # The counter was advanced to read it: give the search a counter at the same point
+        sokoban.node_ids = count(metadata['next_node_id'])
+        size = SearchCheckpoint.write(self.path, metadata, arrays)
+        sokoban.report(f"Checkpoint:file={self.path},expanded={expanded},nodes={len(nodes)},"
+                       f"states={len(visited)},bytes={size}")
+
+    def restore(self, sokoban, settings, visited):
+        """
+        ********************************************************************
+        *
+        * Method name: restore
+        *
+        * Description: Restores a search saved by save: rebuilds the nodes,
+        * the frontier and the visited states, and sets the node counter of
+        * the level where it was.
+        *
+        * Calling arguments:
+        * - sokoban: The Sokoban level being solved.
+        * - settings: Dictionary of the search settings, which must be the
+        *   ones of the checkpoint.
+        * - visited: Empty visited states store of the same backend.
+        *
+        * Return value: Tuple (initial node, frontier, expanded nodes).
+        * List of Checked Exceptions: ValueError if the checkpoint belongs
+        * to another level or search, or has no nodes.
+        *********************************************************************
+        """
+        metadata, arrays = SearchCheckpoint.read(self.resume_path)
+        if metadata['settings'] != settings:
+            raise ValueError(f"Error: The checkpoint was saved with different settings: {metadata['settings']}")
+
+        if not arrays['node_id']:
+            raise ValueError(f"Error: The checkpoint {self.resume_path} is corrupt: it has no nodes.")
+        box_count = metadata['box_count']
+        flat = arrays['configurations']
+        if box_count:
+            configurations = [tuple(flat[start:start + box_count]) for start in range(0, len(flat), box_count)]
+        else:
+            configurations = [()]  # The only configuration of a level without boxes
+        sokoban.box_configurations = {boxes: boxes for boxes in configurations}
+        actions = metadata['actions'].split("\n")
+        nodes = []
+        for position, node_id in enumerate(arrays['node_id']):
+            parent = arrays['parent'][position]
+            boxes = configurations[arrays['boxes'][position]]
+            key_player = arrays['key_player'][position]
+            node = Node(node_id, nodes[parent] if parent != -1 else None, None, arrays['value'][position],
+                        arrays['depth'][position], arrays['cost'][position], arrays['heuristic'][position],
+                        actions[position], boxes, arrays['player'][position],
+                        (key_player, boxes) if key_player != -1 else None)
+            node.boxes_on_target = arrays['boxes_on_target'][position]
+            nodes.append(node)
+        initial_node = nodes[0]
+        initial_node.state_id = sokoban.level_id
+
+        frontier = Frontier()
+        frontier.nodes = [(nodes[position].value, nodes[position].node_id, nodes[position])
+                          for position in arrays['frontier']]  # Already a heap
+        frontier.peak_size = len(frontier.nodes)
+        visited.load(metadata['visited'], arrays['visited'])
+        sokoban.node_ids = count(metadata['next_node_id'])
+        return initial_node, frontier, metadata['expanded']
@@ -0,0 +1,76 @@
+class SearchResult:
+    """
+    ********************************************************************
+    *
+    * Class name: SearchResult
+    *
+    * Name of the original author: Carlos Ruiz García-Casarrios
+    *
+    * Description of the class: The SearchResult class is the value
+    * returned by Sokoban.solve, so the solver can be used as a library
+    * without parsing the printed nodes. It holds whether a solution was
+    * found, the solution path (the nodes after the initial node, with
+    * their uUrRdDlL actions), the moves as a single string, the cost and
+    * depth of the last node, the number of expanded nodes, the search
+    * time and whether a budget stopped the search. The nodes keep their
+    * state IDs unset unless they were printed; as_dict gives a JSON-ready
+    * summary without them.
+    *
+    *********************************************************************
+    """
+
+    def __init__(self, strategy, found, path, expanded, elapsed, stopped=False):
+        """
+        ********************************************************************
+        *
+        * Method name: __init__
+        *
+        * Description: Builds the result of a search.
+        *
+        * Calling arguments:
+        * - strategy: The search strategy.
+        * - found: Whether a solution was found.
+        * - path: List of nodes of the solution after the initial node (empty
+        *   if there is no solution or the level is already solved).
+        * - expanded: Number of nodes expanded by the search.
+        * - elapsed: Search time in seconds.
+        * - stopped: Whether the node or time budget stopped the search.
+        *
+        * Return value: None
+        *********************************************************************
+        """
+        self.strategy = strategy
+        self.found = found
+        self.path = path
+        self.expanded = expanded
+        self.time = elapsed
+        self.stopped = stopped
+        self.moves = "".join(node.action for node in path)
+        self.cost = path[-1].cost if path else 0.0
+        self.depth = path[-1].depth if path else 0
+
+    def as_dict(self):
+        """
+        ********************************************************************
+        *
+        * Method name: as_dict
+        *
+        * Description: Returns the result without the nodes.
+        *
+        * Return value: Dictionary of the result.
+        *********************************************************************
+        """
+        return {
+            'strategy': self.strategy,
+            'found': self.found,
+            'moves': self.moves,
+            'cost': self.cost,
+            'depth': self.depth,
+            'expanded': self.expanded,
+            'time': self.time,
+            'stopped': self.stopped,
+        }
+
+    def __repr__(self):
+        return (f"SearchResult(strategy={self.strategy!r}, found={self.found}, moves={self.moves!r}, "
+                f"cost={self.cost:.2f}, depth={self.depth}, expanded={self.expanded})")
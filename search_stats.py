@@ -0,0 +1,207 @@
+import json
+from time import perf_counter
+from types import SimpleNamespace
+
+
+class SearchStats:
+    """
+    ********************************************************************
+    *
+    * Class name: SearchStats
+    *
+    * Name of the original author: Carlos Ruiz García-Casarrios
+    *
+    * Description of the class: The SearchStats class collects the
+    * statistics of a T3 search: nodes generated, expanded and pruned by
+    * deadlock detection, duplicates found in the visited states, peak
+    * frontier size, and the wall time spent in each phase of the search
+    * (successor generation, heuristic evaluation, frontier operations,
+    * visited state lookups and printing of the path). The search only
+    * wraps its operations with the timers of this class when statistics
+    * are requested, so normal runs pay nothing for them. The report can
+    * be printed as text or as a JSON object.
+    *
+    *********************************************************************
+    """
+
+    PHASES = ['generate_succesors', 'assign_heuristic', 'frontier_add', 'frontier_pop', 'visited', 'print_path']
+
+    def __init__(self):
+        """
+        ********************************************************************
+        *
+        * Method name: __init__
+        *
+        * Description: Initializes the counters and the phase timers.
+        *
+        * Return value: None
+        *********************************************************************
+        """
+        self.counts = {'generated': 0, 'expanded': 0, 'lookups': 0}
+        self.times = dict.fromkeys(SearchStats.PHASES, 0.0)
+        self.pruned = 0
+        self.frontier_peak = 0
+        self.visited_states = 0
+        self.total_time = 0.0
+        self.started = None
+        self.pruned_at_start = 0
+
+    def start(self, deadlocks):
+        """
+        ********************************************************************
+        *
+        * Method name: start
+        *
+        * Description: Starts the wall clock of the search and remembers the
+        * pruning counters of the deadlock detector, which belong to the
+        * level and may already count earlier searches.
+        *
+        * Calling arguments:
+        * - deadlocks: The DeadlockDetector of the level.
+        *
+        * Return value: None
+        *********************************************************************
+        """
+        self.pruned_at_start = deadlocks.pruned_dead_squares + deadlocks.pruned_dynamic
+        self.started = perf_counter()
+
+    def stop(self, deadlocks):
+        """
+        ********************************************************************
+        *
+        * Method name: stop
+        *
+        * Description: Stops the wall clock and records the successors
+        * pruned during the search.
+        *
+        * Calling arguments:
+        * - deadlocks: The DeadlockDetector of the level.
+        *
+        * Return value: None
+        *********************************************************************
+        """
+        self.total_time = perf_counter() - self.started
+        self.pruned = deadlocks.pruned_dead_squares + deadlocks.pruned_dynamic - self.pruned_at_start
+
+    def record_search(self, frontier, visited):
+        """
+        ********************************************************************
+        *
+        * Method name: record_search
+        *
+        * Description: Records the final sizes of the search structures.
+        *
+        * Calling arguments:
+        * - frontier: The Frontier of the search.
+        * - visited: The visited states store of the search.
+        *
+        * Return value: None
+        *********************************************************************
+        """
+        self.frontier_peak = frontier.peak_size
+        self.visited_states = len(visited)
+
+    def timed(self, phase, function, counter=None):
+        """
+        ********************************************************************
+        *
+        * Method name: timed
+        *
+        * Description: Wraps a function so that its wall time is added to a
+        * phase and, optionally, its calls are counted.
+        *
+        * Calling arguments:
+        * - phase: Name of the phase, one of PHASES.
+        * - function: The function to wrap.
+        * - counter: Name of the counter of calls, or None.
+        *
+        * Return value: The wrapped function.
+        *********************************************************************
+        """
+        times = self.times
+        counts = self.counts
+        clock = perf_counter
+
+        def wrapper(*args):
+            start = clock()
+            result = function(*args)
+            times[phase] += clock() - start
+            if counter is not None:
+                counts[counter] += 1
+            return result
+        return wrapper
+
+    def timed_estimator(self, estimator):
+        """
+        ********************************************************************
+        *
+        * Method name: timed_estimator
+        *
+        * Description: Wraps a heuristic estimator so that the time of its
+        * estimate and update methods is added to the heuristic phase.
+        *
+        * Calling arguments:
+        * - estimator: A DistanceHeuristic or AssignmentHeuristic.
+        *
+        * Return value: An object with the same two methods, timed.
+        *********************************************************************
+        """
+        return SimpleNamespace(estimate=self.timed('assign_heuristic', estimator.estimate),
+                               update=self.timed('assign_heuristic', estimator.update))
+
+    def as_dict(self):
+        """
+        ********************************************************************
+        *
+        * Method name: as_dict
+        *
+        * Description: Gathers all the statistics, with the times in seconds.
+        * The time not spent in any phase is reported as other, and the hit
+        * rate is the share of visited state lookups that found a duplicate.
+        *
+        * Return value: Dictionary of statistics.
+        *********************************************************************
+        """
+        lookups = self.counts['lookups']
+        duplicates = lookups - self.counts['expanded'] if lookups else 0
+        times = dict(self.times)
+        times['other'] = max(self.total_time - sum(self.times.values()), 0.0)
+        return {
+            'generated': self.counts['generated'],
+            'expanded': self.counts['expanded'],
+            'pruned': self.pruned,
+            'duplicates': duplicates,
+            'frontier_peak': self.frontier_peak,
+            'visited_states': self.visited_states,
+            'visited_hit_rate': duplicates / lookups if lookups else 0.0,
+            'total_time': self.total_time,
+            'times': times,
+            'nodes_per_sec': self.counts['expanded'] / self.total_time if self.total_time else 0.0,
+        }
+
+    def report(self, output_format='TEXT'):
+        """
+        ********************************************************************
+        *
+        * Method name: report
+        *
+        * Description: Formats the statistics as text or as a JSON object.
+        *
+        * Calling arguments:
+        * - output_format: TEXT or JSON.
+        *
+        * Return value: The report string.
+        *********************************************************************
+        """
+        stats = self.as_dict()
+        if output_format == 'JSON':
+            return json.dumps(stats, sort_keys=True)
+        times = ",".join(f"{phase}={seconds:.4f}s" for phase, seconds in stats['times'].items())
+        return "\n".join([
+            f"Nodes:generated={stats['generated']},expanded={stats['expanded']},"
+            f"pruned={stats['pruned']},duplicates={stats['duplicates']}",
+            f"Frontier:peak={stats['frontier_peak']}",
+            f"Visited:states={stats['visited_states']},hit_rate={100 * stats['visited_hit_rate']:.1f}%",
+            f"Time:total={stats['total_time']:.4f}s,{times}",
+            f"Speed:nodes_per_sec={stats['nodes_per_sec']:.0f}",
+        ])
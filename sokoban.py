@@ -1,14 +1,35 @@
 #!/usr/bin/python3
 
 import argparse
+import io
 import sys
 import re
 import hashlib
+from time import perf_counter
 
 from node import Node
+from board_index import BoardIndex
+from deadlock_detector import DeadlockDetector
+from assignment_heuristic import AssignmentHeuristic
+from distance_heuristic import DistanceHeuristic
 from frontier import Frontier
 from visited_states import VisitedStates
+from search_stats import SearchStats
+from search_result import SearchResult
+from search_checkpoint import SearchCheckpoint
+from solution_cache import SolutionCache
+from fingerprint_visited_states import FingerprintVisitedStates
+from disk_visited_states import DiskVisitedStates
 from collections import deque
+from itertools import count
+from bisect import insort
+from batch_solver import BatchSolver
+from portfolio_solver import PortfolioSolver
+from bidirectional_search import BidirectionalSearch
+from ida_star_search import IDAStarSearch
+from anytime_search import AnytimeSearch
+from solver_server import SolverServer
+from transposition_table import TranspositionTable
 
 class Sokoban:
     """
@@ -23,7 +44,10 @@ class Sokoban:
     *
     **********************************************************************
     """
-    targets_position = []
+    VISITED_BACKENDS = ['SET', 'FINGERPRINT64', 'FINGERPRINT128', 'DISK64', 'DISK128']
+    STRATEGIES = ["BFS", "DFS", "UC", "A*", "IDA*", "GREEDY", "BIDIRECTIONAL", "ANYTIME"]
+    START, EXPAND, SOLUTION, NO_SOLUTION, STOPPED = \
+        "START", "EXPAND", "SOLUTION", "NO SOLUTION", "STOPPED"  # Search events
     def __init__(self, level_string):
         """
         ********************************************************************
@@ -45,7 +69,20 @@ class Sokoban:
         self.columns = self.count_columns()
         self.matrix = self.create_level_matrix()
         self.get_level_assets()
+        self.board = BoardIndex(self.matrix, self.rows, self.columns)
+        self.deadlocks = DeadlockDetector(self.board)
+        self.assignment = None  # AssignmentHeuristic, built on first use
+        self.box_configurations = {}  # Interned box tuples of the current search
+        self.output = None  # Stream of the T3 output (None for sys.stdout)
+        self.log = None  # Stream of the search reports (None for sys.stderr)
+        self.node_ids = None  # Counter numbering the nodes of the current search
+        self.quiet = False  # Print only a result line instead of the nodes
+        self.printed_nodes = []  # Nodes printed (or held back in quiet mode) by the last T3 search
+        self.expanded = 0  # Nodes expanded by the last T3 search
+        self.player_cell = self.board.cell(self.player_position)
+        self.boxes_cells = tuple(self.board.cell(box) for box in self.boxes_position)
         self.level_id = self.generate_level_id(self.player_position, self.boxes_position)
+        self.level_key = (self.player_cell, self.boxes_cells)
 
     def get_level_assets(self):
         """
@@ -63,7 +100,7 @@ class Sokoban:
         *********************************************************************
         """
         self.walls_position = []
-        Sokoban.targets_position = []
+        self.targets_position = []
         self.player_position = None
         self.boxes_position = []
         self.boxes_pos_aux = []
@@ -74,7 +111,7 @@ class Sokoban:
                 if element == '#':
                     self.walls_position.append((i, j))
                 if element in ['.', '*']:
-                    Sokoban.targets_position.append((i, j))
+                    self.targets_position.append((i, j))
                 if element in ['@', '+']:
                     self.player_position = (i, j)
                 if element in ['$', '*']:
@@ -102,9 +139,60 @@ class Sokoban:
         """
         parser = argparse.ArgumentParser()
         parser.add_argument('action')
-        parser.add_argument('-l', '-level', type=str, required=True)
-        parser.add_argument('-s', type=str, help='Strategy for T3 (BFS, DFS, UC, A*, GREEDY)')
+        parser.add_argument('-l', '-level', type=str)
+        parser.add_argument('-s', type=str,
+                            help='Strategy for T3 (BFS, DFS, UC, A*, IDA*, GREEDY, BIDIRECTIONAL, ANYTIME, PORTFOLIO)')
         parser.add_argument('-d', type=int, help='Maximum depth for T3')
+        parser.add_argument('-m', type=str.upper, choices=['MOVES', 'PUSHES'], default='MOVES',
+                            help='Search mode for T3: single moves or pushes only (macro moves)')
+        parser.add_argument('-H', type=str.upper, choices=['MANHATTAN', 'PUSH', 'ASSIGNMENT'], default='MANHATTAN',
+                            help='Heuristic for A*, IDA* and GREEDY in T3')
+        parser.add_argument('--no-pruning', action='store_true',
+                            help='Disable deadlock pruning in T3 (grading-compatible output)')
+        parser.add_argument('--portfolio', type=str.upper, default='BFS,A*,GREEDY,DFS',
+                            help='PORTFOLIO: comma-separated STRATEGY[:HEURISTIC] members to race')
+        parser.add_argument('--optimal', action='store_true',
+                            help='PORTFOLIO: wait for the first solution of an optimal member (UC, A*, IDA*; BFS in MOVES mode)')
+        parser.add_argument('--tt-size', type=int, default=0,
+                            help='IDA*: number of slots of the transposition table (0 disables it)')
+        parser.add_argument('--tt-policy', type=str.upper, choices=TranspositionTable.POLICIES, default='DEPTH',
+                            help='IDA*: replacement policy of the transposition table')
+        parser.add_argument('--weight', type=float, default=5.0,
+                            help='ANYTIME: weight of the heuristic in the first round')
+        parser.add_argument('--weight-step', type=float, default=0.5,
+                            help='ANYTIME: amount the weight is lowered after every round')
+        parser.add_argument('--max-nodes', type=int,
+                            help='Nodes expanded by this run before stopping (frontier strategies and ANYTIME)')
+        parser.add_argument('--max-seconds', type=float,
+                            help='Search time of this run before stopping (frontier strategies and ANYTIME)')
+        parser.add_argument('--checkpoint', type=str,
+                            help='Save the search to this file periodically and when it stops')
+        parser.add_argument('--checkpoint-interval', type=float, default=60.0,
+                            help='Seconds between two checkpoints')
+        parser.add_argument('--resume', type=str, help='Resume the search from this checkpoint file')
+        parser.add_argument('--visited', type=str.upper, choices=Sokoban.VISITED_BACKENDS,
+                            help='T3: visited states store (SET by default) and report its occupancy on stderr')
+        parser.add_argument('--visited-capacity', type=int, default=1 << 16,
+                            help='T3: initial number of slots of the FINGERPRINT and DISK stores')
+        parser.add_argument('--visited-dir', type=str,
+                            help='T3: directory of the DISK store file (system temporary directory by default)')
+        parser.add_argument('-q', '--quiet', action='store_true',
+                            help='T3: print a single result line (moves, cost, depth, stats) instead of the nodes')
+        parser.add_argument('--stats', type=str.upper, nargs='?', const='TEXT', choices=['TEXT', 'JSON'],
+                            help='T3: report search statistics on stderr, as TEXT (default) or JSON')
+        parser.add_argument('--cache', type=str,
+                            help='T3: SQLite file of the solution cache (disabled by default)')
+        parser.add_argument('--cache-size', type=int, default=1000,
+                            help='T3: maximum number of results kept in the solution cache')
+        parser.add_argument('-f', type=str, default='-',
+                            help='BATCH: file with one level per line (- for stdin)')
+        parser.add_argument('--task', type=str.upper, choices=['T1', 'T2S', 'T2T', 'T3'], default='T3',
+                            help='BATCH: action to run on every level')
+        parser.add_argument('-w', '--workers', type=int, help='BATCH/SERVE: number of worker processes')
+        parser.add_argument('--timeout', type=float, help='BATCH: time limit per level in seconds')
+        parser.add_argument('--memory', type=int, help='BATCH: memory cap per worker in MB')
+        parser.add_argument('--socket', type=str, help='SERVE: listen on this Unix socket instead of stdin')
+        parser.add_argument('--threads', action='store_true', help='SERVE: solve on threads instead of processes')
         return parser.parse_args()
 
     def count_rows(self):
@@ -230,17 +318,21 @@ class Sokoban:
         * Name of the original author: Carlos Ruiz García-Casarrios
         *
         * Description of the Method: Checks if all boxes are positioned on
-        * their respective target positions, indicating a goal state.
+        * their respective target positions, indicating a goal state. The
+        * boxes are given as cell IDs and looked up in the target bitmap.
         * Return value: True if all boxes are on targets, False otherwise.
         * Required Files: none
         * List of Checked Exceptions: none
         *********************************************************************
         """
-        return all(pos in Sokoban.targets_position for pos in boxes_position)
+        targets = self.board.targets
+        return all(targets[box] for box in boxes_position)
 
 
         
-    def search_algorithm(self, initial_node, strategy, max_depth):
+    def search_algorithm(self, initial_node, strategy, max_depth, pruning=True, mode='MOVES', heuristic='MANHATTAN',
+                         progress=None, visited=None, stats=None, expansions=True, max_nodes=None, max_seconds=None,
+                         checkpoint=None):
         """
         ********************************************************************
         *
@@ -253,48 +345,287 @@ class Sokoban:
         * The method initializes the frontier, visited states, and solution
         * variables, adding the initial node to the frontier. It then iterates
         * through the frontier, expanding nodes and generating successors until
-        * a solution is found or the frontier is empty.
-        * Return value: None
+        * a solution is found or the frontier is empty. When pruning is
+        * enabled, pushes that lead to a deadlock are not generated. In
+        * PUSHES mode every successor is a push (preceded by the walk to the
+        * box) and the walks are expanded back into moves when printing.
+        * The heuristic selects the estimate used by A* and GREEDY: the
+        * Manhattan or the push distance to the nearest target, or the
+        * box-to-target assignment. Each child inherits the heuristic and
+        * the number of boxes on target of its parent, updated only for the
+        * pushed box, so the goal test does not rescan the boxes. Box
+        * configurations are interned for the duration of the search, so all
+        * nodes with the same boxes share one tuple. If a progress object
+        * (such as a multiprocessing.Value) is given, the number of expanded
+        * nodes is published in its value attribute while searching. The
+        * visited states are kept in the given store (a set by default).
+        * If a SearchStats object is given, the operations of the search are
+        * wrapped with its timers and counters. Nothing is printed: the
+        * search is a generator of events (see search_events), yielding one
+        * EXPAND event per expanded node unless expansions is False, so the
+        * caller can stop it at any point by closing it. The search also
+        * stops by itself, with a STOPPED event, once it has expanded
+        * max_nodes nodes or run for max_seconds seconds. If a
+        * SearchCheckpoint is given, the search is resumed from its resume
+        * file and saved to its file every interval seconds and when it
+        * stops; the budgets and the interval are checked every 1024
+        * expansions (or exactly at max_nodes), always between two
+        * expansions, so a resumed search continues exactly where it was.
+        * Return value: Generator of (event, payload) tuples.
         * Required Files: none
         * List of Checked Exceptions: none
         *********************************************************************
         """
-        visited = VisitedStates()
+        if visited is None:
+            visited = VisitedStates()
+        self.box_configurations = {}
+        expand = self.generate_push_succesors if mode == 'PUSHES' else self.generate_succesors
+        keep_keys = mode == 'PUSHES'  # Only push-level keys differ from (player, boxes)
+        estimator = self.heuristic_estimator(heuristic)
         solution = False
-        frontier = Frontier()
-        initial_node.assign_heuristic(strategy, self.boxes_position, Sokoban.targets_position)
-        initial_node.assign_value(strategy)
-        frontier.add(initial_node)
-        print(initial_node)
-        
-        while not frontier.is_empty():
-            node = frontier.pop(strategy)  # Pop from the front for all strategies
-            if self.is_goal_state(node.boxes_position):
-                solution = True
-                break
-            else:
-                if node.depth < max_depth:
-                    if not visited.is_visited(node.state_id):
-                        visited.add_state(node.state_id)
-                        successors = self.generate_succesors(node.player_position, node.boxes_position)
-                        for action, new_state, cost, new_player_pos, new_boxes_pos in successors:
-                            new_node = Node(node.node_id, node, new_state, 0, node.depth + 1, node.cost + cost, 0.00, action, new_boxes_pos, new_player_pos)
-                            new_node.assign_heuristic(strategy, new_boxes_pos, Sokoban.targets_position)
-                            new_node.assign_value(strategy)
-                            frontier.add(new_node)
+        stopped = False
+        settings = {'level': self.id_md5(self.level_string), 'strategy': strategy, 'max_depth': max_depth,
+                    'pruning': pruning, 'mode': mode, 'heuristic': heuristic, 'visited': visited.backend}
+        if checkpoint is not None and checkpoint.resume_path is not None:
+            initial_node, frontier, expanded = checkpoint.restore(self, settings, visited)
+        else:
+            expanded = 0
+            frontier = Frontier()
+            initial_node.assign_heuristic(strategy, self.boxes_cells, self.targets_position, estimator)
+            initial_node.boxes_on_target = sum(self.board.targets[box] for box in self.boxes_cells)
+            initial_node.assign_value(strategy)
+            frontier.add(initial_node)
+        node_ids = self.node_ids
+        self.expanded = expanded
+        started = perf_counter()
+        budget = expanded + max_nodes if max_nodes is not None else None  # Budgets count this run only
+        next_check = expanded + 1024 if budget is None else min(expanded + 1024, budget)
+        next_save = started + checkpoint.interval if checkpoint is not None else None
+        yield Sokoban.START, initial_node
+        add, pop = frontier.add, frontier.pop
+        is_visited, add_state = visited.is_visited, visited.add_state
+        if stats is not None:
+            expand = stats.timed('generate_succesors', expand, 'expanded')
+            add = stats.timed('frontier_add', add, 'generated')
+            pop = stats.timed('frontier_pop', pop)
+            is_visited = stats.timed('visited', is_visited, 'lookups')
+            add_state = stats.timed('visited', add_state)
+            if estimator is not None:
+                estimator = stats.timed_estimator(estimator)
         
-        path = deque()
-        if solution:
+        try:
+            while not frontier.is_empty():
+                node = pop(strategy)  # Pop from the front for all strategies
+                if node.is_goal():
+                    solution = True
+                    break
+                else:
+                    if node.depth < max_depth:
+                        state_key = node.key()
+                        if not is_visited(state_key):
+                            add_state(state_key)
+                            expanded += 1
+                            if expansions:
+                                yield Sokoban.EXPAND, node
+                            successors = expand(node.player_position, node.boxes_position, pruning)
+                            for action, new_state_key, cost, new_player_pos, new_boxes_pos in successors:
+                                if not keep_keys:
+                                    new_state_key = None  # Rebuilt by Node.key() when popped
+                                new_node = Node(next(node_ids), node, None, 0, node.depth + 1, node.cost + cost, 0.00, action, new_boxes_pos, new_player_pos, new_state_key)
+                                if action.isupper():
+                                    # The player steps into the old box cell and the box moves one cell further
+                                    moved_to = new_player_pos + self.board.offsets[action]
+                                    new_node.inherit_heuristic(strategy, self.board.targets, estimator, new_player_pos, moved_to)
+                                else:
+                                    new_node.inherit_heuristic(strategy, self.board.targets, estimator)
+                                new_node.assign_value(strategy)
+                                add(new_node)
+                            if expanded >= next_check:
+                                next_check = expanded + 1024 if budget is None else min(expanded + 1024, budget)
+                                if progress is not None:
+                                    progress.value = expanded
+                                now = perf_counter()
+                                # With the frontier empty the search is over anyway: it reports NO SOLUTION
+                                if not frontier.is_empty() and \
+                                        ((budget is not None and expanded >= budget) or
+                                         (max_seconds is not None and now - started >= max_seconds)):
+                                    stopped = True
+                                    break
+                                if checkpoint is not None and checkpoint.path and now >= next_save:
+                                    checkpoint.save(self, settings, frontier, visited, expanded)
+                                    node_ids = self.node_ids  # Replaced by save, at the same point
+                                    next_save = perf_counter() + checkpoint.interval
+        finally:
+            # Also runs when the caller stops the search early
+            self.expanded = expanded
+            if progress is not None:
+                progress.value = expanded
+            if stats is not None:
+                stats.record_search(frontier, visited)
+        if stopped:
+            if checkpoint is not None and checkpoint.path:
+                checkpoint.save(self, settings, frontier, visited, expanded)
+            yield Sokoban.STOPPED, None
+        elif solution:
+            path = deque()
             while node.parent_id is not None:
                 path.appendleft(node)
                 node = node.parent_id
 
-            for n in path:
-                print(n)
+            if mode == 'PUSHES':
+                self.expand_push_actions(path)
+            yield Sokoban.SOLUTION, list(path)
         else:
-            print("NO SOLUTION")
-        
-    def generate_succesors(self, plr_position, boxs_position):
+            yield Sokoban.NO_SOLUTION, None
+
+    def heuristic_estimator(self, heuristic):
+        """
+        ********************************************************************
+        *
+        * Method name: heuristic_estimator
+        *
+        * Name of the original author: Carlos Ruiz García-Casarrios
+        *
+        * Description of the Method: Returns the estimator object for the
+        * given heuristic name, built on the precomputed tables of the board
+        * index. Levels without targets get None, so Node falls back to
+        * Node.manhattan_distance, which is infinite for any box there.
+        * Return value: Estimator object or None.
+        * Required Files: none
+        * List of Checked Exceptions: none
+        *********************************************************************
+        """
+        if not self.board.target_cells:
+            return None
+        if heuristic == 'ASSIGNMENT':
+            if self.assignment is None:
+                self.assignment = AssignmentHeuristic(self.board)
+            return self.assignment
+        if heuristic == 'PUSH':
+            return DistanceHeuristic(self.board.push_distances)
+        return DistanceHeuristic(self.board.manhattan_distances)
+
+    def expand_push_actions(self, path):
+        """
+        ********************************************************************
+        *
+        * Method name: expand_push_actions
+        *
+        * Name of the original author: Carlos Ruiz García-Casarrios
+        *
+        * Description of the Method: Turns the push actions of a PUSHES mode
+        * solution path into full uUrRdDlL move strings, prefixing each push
+        * with the shortest walk from where the player stood in the parent
+        * node to the cell behind the pushed box.
+        * Return value: None (modifies the action of the nodes in place).
+        * Required Files: none
+        * List of Checked Exceptions: none
+        *********************************************************************
+        """
+        for node in path:
+            parent = node.parent_id
+            reach = self.board.reachable(parent.player_position, set(parent.boxes_position))
+            for push, behind_cell, _ in self.board.box_pushes[node.player_position]:
+                if push == node.action:
+                    node.action = self.board.walk_path(reach, behind_cell) + push
+                    break
+
+    def print_node(self, node):
+        """
+        ********************************************************************
+        *
+        * Method name: print_node
+        *
+        * Name of the original author: Carlos Ruiz García-Casarrios
+        *
+        * Description of the Method: Prints a search node. The MD5 state ID
+        * is only needed for the output, so it is computed here the first
+        * time the node is printed instead of once per generated successor.
+        * The node is also kept for the result line of the quiet mode, in
+        * which it is not printed, and for the solution cache.
+        * Return value: None
+        * Required Files: none
+        * List of Checked Exceptions: none
+        *********************************************************************
+        """
+        self.printed_nodes.append(node)
+        if self.quiet:
+            return
+        if node.state_id is None:
+            node.state_id = self.generate_level_id(self.board.position(node.player_position),
+                                                   self.board.positions(node.boxes_position))
+        print(node, file=self.output)
+
+    def report(self, line):
+        """
+        ********************************************************************
+        *
+        * Method name: report
+        *
+        * Name of the original author: Carlos Ruiz García-Casarrios
+        *
+        * Description of the Method: Writes a line of the search reports
+        * (iterations, solutions, checkpoints, statistics) to the log stream
+        * of this level, so concurrent solves do not mix them.
+        * Return value: None
+        * Required Files: none
+        * List of Checked Exceptions: none
+        *********************************************************************
+        """
+        print(line, file=self.log if self.log is not None else sys.stderr)
+
+    def print_cached_result(self, cached):
+        """
+        ********************************************************************
+        *
+        * Method name: print_cached_result
+        *
+        * Name of the original author: Carlos Ruiz García-Casarrios
+        *
+        * Description of the Method: Prints a result of the solution cache as
+        * the search would have printed it, with the state IDs recomputed
+        * on this level.
+        * Calling arguments: cached (dict) result returned by the cache
+        * Return value: True if the cached result is a solution, False otherwise
+        * Required Files: solution_cache.py
+        * List of Checked Exceptions: none
+        *********************************************************************
+        """
+        started = perf_counter()
+        self.expanded = cached['expanded']
+        for node in SolutionCache.restore_nodes(self, cached['nodes']):
+            self.print_node(node)
+        if not cached['found']:
+            print("NO SOLUTION", file=self.output)
+        elif self.quiet:
+            print(self.result_line(self.expanded, perf_counter() - started), file=self.output)
+        return cached['found']
+
+    def result_line(self, expanded, elapsed):
+        """
+        ********************************************************************
+        *
+        * Method name: result_line
+        *
+        * Name of the original author: Carlos Ruiz García-Casarrios
+        *
+        * Description of the Method: Builds the single line printed by T3 in
+        * quiet mode from the nodes held back by print_node: the initial node
+        * followed by the solution path.
+        * Calling arguments: expanded (int) nodes expanded by the search,
+        * elapsed (float) search time in seconds
+        * Return value: String with the moves, cost and depth of the solution
+        * and the number of expanded nodes and the time of the search
+        * Required Files: none
+        * List of Checked Exceptions: none
+        *********************************************************************
+        """
+        last = self.printed_nodes[-1]
+        moves = "".join(node.action for node in self.printed_nodes[1:])
+        return (f"moves={moves},cost={last.cost:.2f},depth={last.depth},"
+                f"expanded={expanded},time={elapsed:.4f}s")
+
+    def generate_succesors(self, plr_position, boxs_position, pruning=False):
         """
         ********************************************************************
         *
@@ -304,41 +635,99 @@ class Sokoban:
         *
         * Description of the Method: Executes the T2S action to generate
         * all possible successor states from the current game state based
-        * on player movements and box pushes. It considers the player's
-        * position, walls, and boxes to determine valid actions, storing
-        * the resulting states and their corresponding level IDs.
+        * on player movements and box pushes. The player and the boxes are
+        * given as cell IDs; walls and moves come from the precomputed board
+        * index, so every check is O(1). The resulting states are stored
+        * with their corresponding state keys. If pruning is True, pushes
+        * that the deadlock detector reports as unsolvable (dead squares,
+        * 2x2 blocks or frozen boxes) are discarded.
         * Return value: List of ordered successors, where each successor
-        * is represented as a tuple containing the action, new level ID,
-        * and cost.
+        * is represented as a tuple containing the action, new state key,
+        * cost, new player position and new boxes positions.
         * Required Files: none
         * List of Checked Exceptions: none
         *********************************************************************
         """
-        directions = {
-            'u': (-1, 0), 'r': (0, 1), 'd': (1, 0), 'l': (0, -1),
-            'U': (-1, 0), 'R': (0, 1), 'D': (1, 0), 'L': (0, -1)
-        }
+        occupied = set(boxs_position)
         successors = []
         cost = 1
-        
-        for action, (di, dj) in directions.items():
-            new_player_pos = (plr_position[0] + di, plr_position[1] + dj)
-            
-            if action.islower() and Sokoban.is_valid_position(new_player_pos, self.walls_position, boxs_position):
-                new_level_id = self.generate_level_id(new_player_pos, boxs_position)
-                successors.append((action, new_level_id, cost, new_player_pos, boxs_position))
 
-            elif action.isupper():
-                box_pos = new_player_pos
-                new_box_pos = (box_pos[0] + di, box_pos[1] + dj)
+        # The neighbor table is already in 'uUrRdDlL' order and skips walls
+        for walk, push, next_cell, beyond_cell in self.board.neighbors[plr_position]:
+            if next_cell not in occupied:
+                successors.append((walk, (next_cell, boxs_position), cost, next_cell, boxs_position))
+            elif beyond_cell != -1 and beyond_cell not in occupied:
+                new_boxes_pos = list(boxs_position)
+                new_boxes_pos.remove(next_cell)
+                insort(new_boxes_pos, beyond_cell)
+                new_boxes_pos = tuple(new_boxes_pos)
+                if pruning and self.deadlocks.is_deadlock(beyond_cell, new_boxes_pos):
+                    continue
+                new_boxes_pos = self.box_configurations.setdefault(new_boxes_pos, new_boxes_pos)
+                successors.append((push, (next_cell, new_boxes_pos), cost, next_cell, new_boxes_pos))
+
+        return successors
+
+    def generate_push_succesors(self, plr_position, boxs_position, pruning=False):
+        """
+        ********************************************************************
+        *
+        * Method name: generate_push_succesors
+        *
+        * Name of the original author: Carlos Ruiz García-Casarrios
+        *
+        * Description of the Method: Generates the successors of a state for
+        * the PUSHES search mode, where only box pushes branch the search.
+        * A flood fill finds the cells the player can walk to; every box
+        * that can be pushed from one of them gives a successor whose cost
+        * is the walk plus the push. States are keyed by the boxes and the
+        * normalized player region (see push_state_key), so positions of the
+        * player inside the same region are a single state.
+        * Return value: List of successors with the same layout as
+        * generate_succesors; the action is only the push letter.
+        * Required Files: none
+        * List of Checked Exceptions: none
+        *********************************************************************
+        """
+        occupied = set(boxs_position)
+        reach = self.board.reachable(plr_position, occupied)
+        successors = []
+
+        for box in boxs_position:
+            for push, behind_cell, beyond_cell in self.board.box_pushes[box]:
+                if behind_cell not in reach or beyond_cell in occupied:
+                    continue
+                new_boxes_pos = list(boxs_position)
+                new_boxes_pos.remove(box)
+                insort(new_boxes_pos, beyond_cell)
+                new_boxes_pos = tuple(new_boxes_pos)
+                if pruning and self.deadlocks.is_deadlock(beyond_cell, new_boxes_pos):
+                    continue
+                new_boxes_pos = self.box_configurations.setdefault(new_boxes_pos, new_boxes_pos)
+                cost = reach[behind_cell][0] + 1
+                new_state_key = self.push_state_key(box, new_boxes_pos)
+                successors.append((push, new_state_key, cost, box, new_boxes_pos))
 
-                if box_pos in boxs_position and Sokoban.can_push_box(box_pos, (di, dj), self.walls_position, boxs_position):
-                    new_boxes_pos = sorted([pos if pos != box_pos else new_box_pos for pos in boxs_position])
-                    new_level_id = self.generate_level_id(new_player_pos, new_boxes_pos)
-                    successors.append((action, new_level_id, cost, new_player_pos, new_boxes_pos))
+        return successors
 
-        ordered_successors = sorted(successors, key=lambda x: 'uUrRdDlL'.index(x[0]))
-        return ordered_successors
+    def push_state_key(self, player_position, boxes_position):
+        """
+        ********************************************************************
+        *
+        * Method name: push_state_key
+        *
+        * Name of the original author: Carlos Ruiz García-Casarrios
+        *
+        * Description of the Method: Builds the state key used in PUSHES
+        * mode, where the player position is normalized to the lowest cell
+        * ID of the region it can reach.
+        * Return value: Tuple (normalized player cell, tuple of box cells).
+        * Required Files: none
+        * List of Checked Exceptions: none
+        *********************************************************************
+        """
+        reach = self.board.reachable(player_position, set(boxes_position))
+        return (min(reach), boxes_position)
 
     
     def print_successors(self, successors):
@@ -351,14 +740,18 @@ class Sokoban:
         *
         * Description of the Method: Prints all the successors generated by
         * the T2S action. Each successor is displayed with its associated action,
-        * new level ID, and the cost of the action.
+        * new level ID, and the cost of the action. The level IDs are hashed
+        * here from the successor positions, since the successors only carry
+        * their compact state keys.
         * Return value: None
         * Required Files: none
         * List of Checked Exceptions: none
         *********************************************************************
         """
         print(f"ID:{self.level_id}")
-        for action, new_level_id, cost, _, _ in successors:
+        for action, _, cost, new_player_pos, new_boxes_pos in successors:
+            new_level_id = self.generate_level_id(self.board.position(new_player_pos),
+                                                  self.board.positions(new_boxes_pos))
             print(f"[{action},{new_level_id},{cost}]")
 
     def level_checker(self):
@@ -400,6 +793,34 @@ class Sokoban:
             formatted_row = [repr(elem) for elem in row]
             print(f"[{', '.join(formatted_row)}]")
 
+    @staticmethod
+    def create_visited_states(backend, capacity=1 << 16, directory=None):
+        """
+        ********************************************************************
+        *
+        * Method name: create_visited_states
+        *
+        * Name of the original author: Carlos Ruiz García-Casarrios
+        *
+        * Description of the Method: Creates the visited states store of T3:
+        * a set of keys (SET, the default), an in-memory table of 64 or
+        * 128-bit fingerprints (FINGERPRINT64, FINGERPRINT128) or the same
+        * table in a memory-mapped file (DISK64, DISK128).
+        * Calling arguments: backend (str or None), capacity (int) initial
+        * slots of the tables, directory (str or None) of the DISK file
+        * Return value: The store, with add_state and is_visited methods
+        * Required Files: visited_states.py, fingerprint_visited_states.py,
+        * disk_visited_states.py
+        * List of Checked Exceptions: none
+        *********************************************************************
+        """
+        if backend is None or backend == 'SET':
+            return VisitedStates()
+        bits = 128 if backend.endswith('128') else 64
+        if backend.startswith('DISK'):
+            return DiskVisitedStates(capacity, bits, directory)
+        return FingerprintVisitedStates(capacity, bits)
+
     @staticmethod
     def validate_t3_args(args):
         """
@@ -412,7 +833,8 @@ class Sokoban:
         * Description of the Method: Validates the arguments provided for
         * the T3 action, specifically checking if the strategy and maximum
         * depth parameters are correctly specified. The function checks that
-        * the strategy is one of the valid values ("BFS", "DFS", "UC", "A*", "GREEDY") and
+        * the strategy is one of the valid values ("BFS", "DFS", "UC", "A*", "IDA*", "GREEDY", "BIDIRECTIONAL",
+        * "ANYTIME", or "PORTFOLIO" to race several of them) and
         * that the maximum depth is an integer.
         * Calling arguments: args (Namespace) - parsed command-line arguments
         * Return value: A tuple containing the strategy (str) and maximum depth (int)
@@ -427,8 +849,8 @@ class Sokoban:
         
         # Convert the strategy to uppercase and validate it
         strategy = str(args.s.upper())
-        if strategy not in ["BFS", "DFS", "UC", "A*", "GREEDY"]:
-            print(f"Error: Strategy {strategy} is not valid. Choose BFS, DFS, UC, A*, or GREEDY.")
+        if strategy not in Sokoban.STRATEGIES + ["PORTFOLIO"]:
+            print(f"Error: Strategy {strategy} is not valid. Choose BFS, DFS, UC, A*, IDA*, GREEDY, BIDIRECTIONAL, ANYTIME, or PORTFOLIO.")
             sys.exit(1)  # Exit if the strategy is not one of the valid options
         
         # Try to convert the maximum depth to an integer
@@ -441,15 +863,6 @@ class Sokoban:
         # Return the validated strategy and maximum depth
         return strategy, max_depth
 
-    @staticmethod
-    def is_valid_position(position, walls, boxes):
-        return position not in walls and position not in boxes
-
-    @staticmethod
-    def can_push_box(box_position, direction, walls, boxes):
-        new_box_pos = (box_position[0] + direction[0], box_position[1] + direction[1])
-        return new_box_pos not in walls and new_box_pos not in boxes
-    
     def execute_T1(self):
         """
         ********************************************************************
@@ -510,12 +923,115 @@ class Sokoban:
         *********************************************************************
         """
        
-        if self.is_goal_state(self.boxes_position):
+        if self.is_goal_state(self.boxes_cells):
             print("TRUE")
         else:
             print("FALSE")
 
-    def execute_T3(self, strategy, max_depth): 
+    def search_events(self, strategy, max_depth, pruning=True, mode='MOVES', heuristic='MANHATTAN', progress=None,
+                      tt_size=0, tt_policy='DEPTH', visited=None, stats=None, expansions=True, weight=5.0,
+                      weight_step=0.5, max_nodes=None, max_seconds=None, checkpoint=None):
+        """
+        ********************************************************************
+        *
+        * Method name: search_events
+        *
+        * Name of the original author: Carlos Ruiz García-Casarrios
+        *
+        * Description of the Method: Runs a T3 search as a generator of
+        * (event, payload) tuples, produced lazily while searching: START
+        * with the initial node, EXPAND with every node about to be expanded,
+        * and finally SOLUTION with the list of nodes of the solution path
+        * after the initial node, NO SOLUTION with None, or STOPPED with None
+        * if the node or time budget ran out first. The caller may
+        * stop the search at any event by breaking out of the loop; the
+        * expanded nodes so far are kept in the expanded attribute. IDA*,
+        * BIDIRECTIONAL and ANYTIME run to completion inside their own
+        * classes, so they only yield START and the final event (for
+        * ANYTIME, the best solution). The arguments are those of
+        * execute_T3; expansions=False omits the EXPAND events. Checkpoints
+        * are only available for the frontier strategies, and budgets for
+        * them and ANYTIME.
+        * Return value: Generator of (event, payload) tuples.
+        * Required Files: none
+        * List of Checked Exceptions: ValueError (if the strategy is not valid
+        * or does not support the checkpoint or the budgets)
+        *********************************************************************
+        """
+        if strategy not in Sokoban.STRATEGIES:
+            raise ValueError(f"Strategy {strategy} is not valid. Choose {', '.join(Sokoban.STRATEGIES)}.")
+        if strategy in ('IDA*', 'BIDIRECTIONAL', 'ANYTIME') and checkpoint is not None:
+            raise ValueError(f"Error: Strategy {strategy} does not support checkpoints.")
+        if strategy in ('IDA*', 'BIDIRECTIONAL') and (max_nodes is not None or max_seconds is not None):
+            raise ValueError(f"Error: Strategy {strategy} does not support node or time budgets.")
+        self.node_ids = count()  # Every search numbers its nodes from 0
+        if strategy == 'BIDIRECTIONAL':
+            initial_node = Node(next(self.node_ids), None, self.level_id, 0.00, 0, 0.00, 0.00, "NOTHING", self.boxes_cells, self.player_cell)
+            search = BidirectionalSearch(self, max_depth, pruning, progress)
+        else:
+            state_key = self.level_key
+            if mode == 'PUSHES':
+                state_key = self.push_state_key(self.player_cell, self.boxes_cells)
+            initial_node = Node(next(self.node_ids), None, self.level_id, 0.00, 0, 0.00, 0.00, "NOTHING", self.boxes_cells, self.player_cell, state_key)
+            if strategy == 'IDA*':
+                search = IDAStarSearch(self, max_depth, pruning, mode, heuristic, tt_size, tt_policy, progress)
+            elif strategy == 'ANYTIME':
+                search = AnytimeSearch(self, max_depth, pruning, mode, heuristic, weight, weight_step, max_nodes,
+                                       max_seconds, progress)
+            else:
+                yield from self.search_algorithm(initial_node, strategy, max_depth, pruning, mode, heuristic,
+                                                 progress, visited, stats, expansions, max_nodes, max_seconds,
+                                                 checkpoint)
+                return
+        path = search.run(initial_node)
+        self.expanded = search.expanded
+        yield Sokoban.START, initial_node
+        if path is None:
+            yield Sokoban.NO_SOLUTION, None
+        else:
+            yield Sokoban.SOLUTION, path
+
+    def solve(self, strategy, max_depth, pruning=True, mode='MOVES', heuristic='MANHATTAN', tt_size=0,
+              tt_policy='DEPTH', visited=None, weight=5.0, weight_step=0.5, max_nodes=None, max_seconds=None,
+              checkpoint=None):
+        """
+        ********************************************************************
+        *
+        * Method name: solve
+        *
+        * Name of the original author: Carlos Ruiz García-Casarrios
+        *
+        * Description of the Method: Solves the level like T3 without
+        * printing anything, for the programs that use the solver as a
+        * library. The arguments are those of execute_T3.
+        * Return value: SearchResult with the solution path, the moves, the
+        * cost, the expanded nodes, the search time and whether a budget
+        * stopped the search.
+        * Required Files: search_result.py
+        * List of Checked Exceptions: ValueError (if the strategy is not valid)
+        *********************************************************************
+        """
+        started = perf_counter()
+        path = []
+        found = stopped = False
+        log = self.log
+        if log is None:
+            self.log = io.StringIO()  # Nothing is printed unless the caller gave a log stream
+        try:
+            for event, payload in self.search_events(strategy, max_depth, pruning, mode, heuristic, None, tt_size,
+                                                     tt_policy, visited, None, False, weight, weight_step,
+                                                     max_nodes, max_seconds, checkpoint):
+                if event == Sokoban.SOLUTION:
+                    found, path = True, payload
+                elif event == Sokoban.STOPPED:
+                    stopped = True
+        finally:
+            self.log = log
+        return SearchResult(strategy, found, path, self.expanded, perf_counter() - started, stopped)
+
+    def execute_T3(self, strategy, max_depth, pruning=True, mode='MOVES', heuristic='MANHATTAN', progress=None,
+                   tt_size=0, tt_policy='DEPTH', visited=None, stats=None, cache=None, weight=5.0,
+                   weight_step=0.5, max_nodes=None, max_seconds=None, checkpoint=None):
         """
         ********************************************************************
         *
@@ -526,57 +1042,171 @@ class Sokoban:
         * Description of the Method: Executes the T3 action to solve the
         * Sokoban level using the specified search strategy and maximum depth.
         * The method initializes the search algorithm with the initial node
-        * and the provided strategy and maximum depth.
-        * Return value: None
+        * and the provided strategy and maximum depth. Deadlock pruning is
+        * enabled by default; disabling it reproduces the full search tree
+        * expected by the grading output. The mode selects between single
+        * moves (MOVES) and push-level macro moves (PUSHES), and the heuristic
+        * between MANHATTAN, PUSH and ASSIGNMENT. The BIDIRECTIONAL strategy
+        * always works at push level and ignores the heuristic. IDA* can use
+        * a transposition table of tt_size slots with the tt_policy
+        * replacement policy. ANYTIME starts with the given weight, lowers it
+        * by weight_step after every round and stops when the node or time
+        * budget runs out. The other strategies keep the visited states
+        * in the given store. If a SearchStats object is given, it collects
+        * the statistics of the search. In quiet mode, the nodes are not
+        * printed and a single result line is written instead. If a
+        * SolutionCache is given, a result cached for the same board and
+        * settings is printed without searching, and a new one is stored.
+        * ANYTIME does not use the cache, since its result depends on the
+        * time budget. The frontier strategies also stop at the node or time
+        * budget, printing SEARCH STOPPED, and are saved to and resumed from
+        * the given SearchCheckpoint.
+        * Return value: True if a solution was found, False otherwise.
         * Required Files: none
         * List of Checked Exceptions: none
         *********************************************************************
         """
-        initial_node = Node(0, None, self.level_id, 0.00, 0, 0.00, 0.00, "NOTHING", self.boxes_position, self.player_position)
-        self.search_algorithm(initial_node, strategy, max_depth)
+        self.printed_nodes = []
+        if strategy == 'ANYTIME':
+            cache = None
+        if cache is not None:
+            cache_key = SolutionCache.make_key(self, strategy, max_depth, pruning, mode, heuristic, tt_size, tt_policy)
+            cached = cache.lookup(cache_key)
+            if cached is not None:
+                return self.print_cached_result(cached)
+        if stats is not None:
+            stats.start(self.deadlocks)
+        print_node = self.print_node
+        if stats is not None:
+            print_node = stats.timed('print_path', print_node)
+        started = perf_counter()
+        found = stopped = False
+        for event, payload in self.search_events(strategy, max_depth, pruning, mode, heuristic, progress, tt_size,
+                                                 tt_policy, visited, stats, False, weight, weight_step,
+                                                 max_nodes, max_seconds, checkpoint):
+            if event == Sokoban.START:
+                print_node(payload)
+            elif event == Sokoban.SOLUTION:
+                found = True
+                for node in payload:
+                    print_node(node)
+            elif event == Sokoban.STOPPED:
+                stopped = True
+                print("SEARCH STOPPED", file=self.output)
+            else:
+                print("NO SOLUTION", file=self.output)
+        if self.quiet and found:
+            print(self.result_line(self.expanded, perf_counter() - started), file=self.output)
+        if stats is not None:
+            if strategy in ('IDA*', 'BIDIRECTIONAL', 'ANYTIME'):
+                stats.counts['expanded'] = self.expanded
+            stats.stop(self.deadlocks)
+        if cache is not None and not stopped:
+            cache.store(cache_key, found, self.expanded, self.printed_nodes)
+        return found
 
-def main():
+def run_action(args):
     """
     ********************************************************************
     *
-    * Method name: main
+    * Method name: run_action
     *
     * Name of the original author: Carlos Ruiz García-Casarrios
     *
-    * Description of the Method: The main function that drives the Sokoban
-    * program. It parses command-line arguments, initializes the Sokoban
-    * game with a level string, checks the validity of the level, and then
-    * executes the corresponding action (T1, T2S, T2T, or T3) based on the
-    * provided arguments.
-    * Calling arguments: none (args are parsed via Sokoban.args_parse())
+    * Description of the Method: Initializes the Sokoban game with the level
+    * string of the arguments, checks the validity of the level, and then
+    * executes the corresponding action (T1, T2S, T2T, or T3). It is shared
+    * by main and by the BATCH workers.
+    * Calling arguments: args (Namespace) - parsed command-line arguments
     * Return value: None
-    * Required Files: sokoban.py (where the Sokoban class and methods are defined)
+    * Required Files: none
     * List of Checked Exceptions: ValueError (if the level is invalid)
     *********************************************************************
     """
-    args = Sokoban.args_parse()  # Parse arguments
     sokoban = Sokoban(args.l)  # Initialize Sokoban with level string
-
-    try:
-        sokoban.level_checker()
-    except ValueError as e:
-        print(e)
-        sys.exit(1)
+    sokoban.level_checker()
 
     if args.action == 'T1':
         sokoban.execute_T1()
     elif args.action == 'T2S':
-        player_position = sokoban.player_position
-        successors = sokoban.generate_succesors(player_position, sokoban.boxes_position)
+        successors = sokoban.generate_succesors(sokoban.player_cell, sokoban.boxes_cells)
         sokoban.print_successors(successors)
     elif args.action == 'T2T':
         sokoban.execute_T2T()
     elif args.action == 'T3':
-        print(args.l)
+        sokoban.quiet = args.quiet
+        if not args.quiet:
+            print(args.l)
         strategy, max_depth = sokoban.validate_t3_args(args)
-        sokoban.execute_T3(strategy, max_depth)
+        if strategy == 'PORTFOLIO':
+            members = PortfolioSolver.parse_members(args.portfolio, args.H)
+            PortfolioSolver(sokoban, members, max_depth, not args.no_pruning, args.m, args.optimal).run()
+        else:
+            visited = Sokoban.create_visited_states(args.visited, args.visited_capacity, args.visited_dir)
+            cache = SolutionCache(args.cache, args.cache_size) if args.cache else None
+            checkpoint = None
+            if args.checkpoint or args.resume:
+                checkpoint = SearchCheckpoint(args.checkpoint, args.checkpoint_interval, args.resume)
+            try:
+                stats = SearchStats() if args.stats else None
+                sokoban.execute_T3(strategy, max_depth, not args.no_pruning, args.m, args.H, None,
+                                   args.tt_size, args.tt_policy, visited, stats, cache, args.weight,
+                                   args.weight_step, args.max_nodes, args.max_seconds, checkpoint)
+                if args.visited is not None:
+                    sokoban.report(visited.report())
+                if stats is not None:
+                    sokoban.report(stats.report(args.stats))
+            finally:
+                visited.close()
+                if cache is not None:
+                    cache.close()
     else:
         print(f"Action '{args.action}' is not valid. Please choose a valid action.")
 
+def main():
+    """
+    ********************************************************************
+    *
+    * Method name: main
+    *
+    * Name of the original author: Carlos Ruiz García-Casarrios
+    *
+    * Description of the Method: The main function that drives the Sokoban
+    * program. It parses command-line arguments and either runs the BATCH
+    * action over a file of levels, the SERVE action that answers JSON
+    * requests, or a single action (T1, T2S, T2T, or T3) on the level
+    * given with -l.
+    * Calling arguments: none (args are parsed via Sokoban.args_parse())
+    * Return value: None
+    * Required Files: sokoban.py (where the Sokoban class and methods are defined)
+    * List of Checked Exceptions: ValueError (if the level is invalid)
+    *********************************************************************
+    """
+    args = Sokoban.args_parse()  # Parse arguments
+
+    if args.action == 'BATCH':
+        if args.task == 'T3':
+            strategy, _ = Sokoban.validate_t3_args(args)  # Fail once instead of once per level
+            if strategy == 'PORTFOLIO':
+                # The members are processes, and the BATCH workers are daemonic, which cannot have children
+                print("Error: Strategy PORTFOLIO cannot be used with BATCH. Run PORTFOLIO on one level at a time.")
+                sys.exit(1)
+        BatchSolver(args).run()
+        return
+
+    if args.action == 'SERVE':
+        SolverServer(args).run()
+        return
+
+    if args.l is None:
+        print("Error: You must specify the level with -l.")
+        sys.exit(1)
+
+    try:
+        run_action(args)
+    except ValueError as e:
+        print(e)
+        sys.exit(1)
+
 if __name__ == '__main__':
     main()
@@ -0,0 +1,283 @@
+import json
+import sqlite3
+import sys
+
+from node import Node
+
+
+class SolutionCache:
+    """
+    ********************************************************************
+    *
+    * Class name: SolutionCache
+    *
+    * Name of the original author: Carlos Ruiz García-Casarrios
+    *
+    * Description of the class: The SolutionCache class keeps the results of
+    * T3 in an SQLite database, so a level that has already been solved with
+    * the same settings is answered without searching again. The key is the
+    * MD5 of the normalized board (the floor regions with the player, the
+    * boxes and the targets, and the cells around them) together with the
+    * strategy, depth, pruning, mode, heuristic and transposition table
+    * settings, so the same board with a padding that the search never
+    * sees hits the same entry. The node IDs, costs, heuristics, values and
+    * actions of the printed nodes are the same for every such padding;
+    * the state IDs depend on the coordinates, so they are not stored but
+    * recomputed by replaying the actions on the level being solved. The
+    * number of entries is bounded: when it is exceeded, the least
+    * recently used ones are evicted.
+    *
+    * Required Files: sqlite3 (standard library)
+    *
+    *********************************************************************
+    """
+
+    MOVES = {'u': (-1, 0), 'r': (0, 1), 'd': (1, 0), 'l': (0, -1)}
+
+    def __init__(self, path, max_entries=1000):
+        """
+        ********************************************************************
+        *
+        * Method name: __init__
+        *
+        * Description: Opens (or creates) the cache database.
+        *
+        * Calling arguments:
+        * - path: File of the database.
+        * - max_entries: Maximum number of cached results.
+        *
+        * Return value: None
+        *********************************************************************
+        """
+        self.max_entries = max_entries
+        self.connection = sqlite3.connect(path, timeout=30)  # BATCH workers may share the file
+        self.connection.execute("CREATE TABLE IF NOT EXISTS solutions "
+                                "(key TEXT PRIMARY KEY, result TEXT NOT NULL, last_used INTEGER NOT NULL)")
+        self.connection.commit()
+
+    @staticmethod
+    def normalize_board(sokoban):
+        """
+        ********************************************************************
+        *
+        * Method name: normalize_board
+        *
+        * Description: Renders the part of the level that the search can see,
+        * so only the padding that cannot change the search is removed. The
+        * relevant cells are the floor regions that hold the player, a box
+        * or a target; the rendering is their bounding box plus a border of
+        * one cell, since the deadlock checks look at the walls next to the
+        * boxes. Walls and cells outside the level are '#', and the floor the
+        * player can never enter is '-', because a 2x2 block is only solid
+        * when it has no floor at all.
+        *
+        * Calling arguments:
+        * - sokoban: The Sokoban level.
+        *
+        * Return value: The normalized board string.
+        *********************************************************************
+        """
+        board = sokoban.board
+        relevant = {sokoban.player_cell, *sokoban.boxes_cells, *board.target_cells}
+        pending = list(relevant)
+        while pending:
+            cell = pending.pop()
+            for _, _, next_cell, _ in board.neighbors[cell]:
+                if next_cell not in relevant:
+                    relevant.add(next_cell)
+                    pending.append(next_cell)
+
+        positions = board.positions(relevant)
+        top = min(i for i, _ in positions) - 1
+        bottom = max(i for i, _ in positions) + 1
+        left = min(j for _, j in positions) - 1
+        right = max(j for _, j in positions) + 1
+        boxes = set(sokoban.boxes_cells)
+        rows = []
+        for i in range(top, bottom + 1):
+            row = []
+            for j in range(left, right + 1):
+                cell = board.cell((i, j)) if 0 <= i < board.rows and 0 <= j < board.columns else -1
+                if cell == -1 or board.walls[cell]:
+                    row.append('#')
+                elif cell not in relevant:
+                    row.append('-')
+                elif cell in boxes:
+                    row.append('*' if board.targets[cell] else '$')
+                elif cell == sokoban.player_cell:
+                    row.append('+' if board.targets[cell] else '@')
+                else:
+                    row.append('.' if board.targets[cell] else ' ')
+            rows.append("".join(row))
+        return "\n".join(rows)
+
+    @staticmethod
+    def make_key(sokoban, strategy, max_depth, pruning, mode, heuristic, tt_size, tt_policy):
+        """
+        ********************************************************************
+        *
+        * Method name: make_key
+        *
+        * Description: Builds the cache key of a search.
+        *
+        * Return value: The key string.
+        *********************************************************************
+        """
+        board_id = sokoban.id_md5(SolutionCache.normalize_board(sokoban))
+        return f"{board_id}|{strategy}|{max_depth}|{int(pruning)}|{mode}|{heuristic}|{tt_size}|{tt_policy}"
+
+    def next_use(self):
+        """
+        ********************************************************************
+        *
+        * Method name: next_use
+        *
+        * Description: Returns the next value of the use counter that orders
+        * the entries from least to most recently used.
+        *
+        * Return value: Integer.
+        *********************************************************************
+        """
+        return self.connection.execute("SELECT COALESCE(MAX(last_used), 0) + 1 FROM solutions").fetchone()[0]
+
+    def lookup(self, key):
+        """
+        ********************************************************************
+        *
+        * Method name: lookup
+        *
+        * Description: Looks up a search result and marks it as used.
+        *
+        * Calling arguments:
+        * - key: The cache key.
+        *
+        * Return value: Dictionary with found, expanded and the node records,
+        * or None on a miss.
+        *********************************************************************
+        """
+        row = self.connection.execute("SELECT result FROM solutions WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        with self.connection:
+            self.connection.execute("UPDATE solutions SET last_used = ? WHERE key = ?", (self.next_use(), key))
+        return json.loads(row[0])
+
+    def store(self, key, found, expanded, nodes):
+        """
+        ********************************************************************
+        *
+        * Method name: store
+        *
+        * Description: Stores a search result and evicts the least recently
+        * used entries beyond the maximum.
+        *
+        * Calling arguments:
+        * - key: The cache key.
+        * - found: Whether a solution was found.
+        * - expanded: Number of nodes expanded by the search.
+        * - nodes: Printed nodes: the initial node followed by the path.
+        *
+        * Return value: None
+        *********************************************************************
+        """
+        records = [[node.node_id, node.parent_id.node_id if node.parent_id else None, node.action,
+                    node.depth, node.cost, node.heuristic, node.value] for node in nodes]
+        result = json.dumps({'found': found, 'expanded': expanded, 'nodes': records})
+        with self.connection:
+            self.connection.execute("INSERT OR REPLACE INTO solutions (key, result, last_used) VALUES (?, ?, ?)",
+                                    (key, result, self.next_use()))
+            self.connection.execute("DELETE FROM solutions WHERE key NOT IN "
+                                    "(SELECT key FROM solutions ORDER BY last_used DESC LIMIT ?)",
+                                    (self.max_entries,))
+
+    @staticmethod
+    def restore_nodes(sokoban, records):
+        """
+        ********************************************************************
+        *
+        * Method name: restore_nodes
+        *
+        * Description: Rebuilds the printed nodes of a cached result on the
+        * level being solved, replaying the actions from its initial state
+        * to compute the state ID of every node.
+        *
+        * Calling arguments:
+        * - sokoban: The Sokoban level being solved.
+        * - records: Node records of the cached result.
+        *
+        * Return value: List of nodes, ready to be printed.
+        *********************************************************************
+        """
+        player = sokoban.player_position
+        boxes = set(sokoban.boxes_position)
+        nodes = {}
+        restored = []
+        for node_id, parent_id, action, depth, cost, heuristic, value in records:
+            if parent_id is not None:
+                for move in action:
+                    di, dj = SolutionCache.MOVES[move.lower()]
+                    player = (player[0] + di, player[1] + dj)
+                    if move.isupper():
+                        boxes.remove(player)
+                        boxes.add((player[0] + di, player[1] + dj))
+            state_id = sokoban.generate_level_id(player, sorted(boxes))
+            node = Node(node_id, nodes.get(parent_id), state_id, value, depth, cost, heuristic, action,
+                        None, None)
+            nodes[node_id] = node
+            restored.append(node)
+        return restored
+
+    def close(self):
+        """
+        ********************************************************************
+        *
+        * Method name: close
+        *
+        * Description: Closes the database.
+        *
+        * Return value: None
+        *********************************************************************
+        """
+        self.connection.close()
+
+
+def main():
+    """
+    ********************************************************************
+    *
+    * Method name: main
+    *
+    * Name of the original author: Carlos Ruiz García-Casarrios
+    *
+    * Description of the Method: Regression check of the cache key: the
+    * padding the search can see must change the key and the padding it
+    * cannot see must not.
+    * Calling arguments: none
+    * Return value: None (exits with status 1 if a check fails)
+    * Required Files: sokoban.py
+    * List of Checked Exceptions: sys.exit() if a check fails
+    *********************************************************************
+    """
+    from sokoban import Sokoban
+
+    def key(level):
+        return SolutionCache.make_key(Sokoban(level), 'BFS', 10, True, 'MOVES', 'MANHATTAN', 0, 'DEPTH')
+
+    # (level, level, whether they must share the key)
+    checks = [
+        (' #.\\n #$\\n @', '#.\\n#$\\n@', False),  # The player can walk into the left margin
+        ('#####\\n#@$.#\\n#####', '\\n   #####\\n   #@$.#   \\n   #####\\n\\n', True),
+        ('####\\n#@$.#\\n#####', '#####\\n#@$.#\\n#####', False),  # The missing corner is floor
+    ]
+    failed = 0
+    for first, second, shared in checks:
+        if (key(first) == key(second)) != shared:
+            failed += 1
+            print(f"FAILED {first!r} and {second!r} should {'' if shared else 'not '}share the key")
+    print(f"Failed:{failed}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
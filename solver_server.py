@@ -0,0 +1,280 @@
+import io
+import json
+import os
+import signal
+import socketserver
+import sys
+import threading
+from multiprocessing.pool import Pool, ThreadPool
+
+
+class SolverServer:
+    """
+    ********************************************************************
+    *
+    * Class name: SolverServer
+    *
+    * Name of the original author: Carlos Ruiz García-Casarrios
+    *
+    * Description of the class: The SolverServer class implements the SERVE
+    * action: a resident solver that reads T3 requests as JSON lines, from
+    * the standard input or from the connections to a Unix socket, solves
+    * them concurrently on a pool of worker processes (or threads) and
+    * writes one JSON line per response as soon as each solve finishes, so
+    * the interpreter is started only once. A request is an object with
+    * the fields id, level, strategy, depth and optionally mode, heuristic,
+    * pruning, quiet, tt_size, tt_policy, weight, weight_step, max_nodes
+    * and max_seconds, named like the command line options; the response
+    * carries the same id, a status (OK or ERROR), whether a solution was
+    * found, the expanded nodes and the output that T3 would have printed,
+    * search reports included. Every solve uses its own Sokoban instance,
+    * which numbers its own nodes and writes its output and its search
+    * reports to its own stream, so solves do not share any state even
+    * when they run as threads.
+    *
+    * Required Files: sokoban.py, multiprocessing, socketserver
+    *
+    *********************************************************************
+    """
+
+    MODES = ["MOVES", "PUSHES"]
+    HEURISTICS = ["MANHATTAN", "PUSH", "ASSIGNMENT"]
+    POLL_SECONDS = 0.2  # How often a waiting stream checks whether its client is gone
+
+    def __init__(self, args):
+        """
+        ********************************************************************
+        *
+        * Method name: __init__
+        *
+        * Description: Stores the server options.
+        *
+        * Calling arguments:
+        * - args: Namespace with workers, socket, threads, cache and
+        *   cache_size.
+        *
+        * Return value: None
+        *********************************************************************
+        """
+        self.workers = args.workers or os.cpu_count() or 1
+        self.socket_path = args.socket
+        self.threads = args.threads
+        self.cache_path = args.cache
+        self.cache_size = args.cache_size
+        self.pool = None
+
+    def run(self):
+        """
+        ********************************************************************
+        *
+        * Method name: run
+        *
+        * Description: Starts the pool and serves the standard input until it
+        * is closed, or the Unix socket until the server is interrupted.
+        *
+        * Return value: None
+        *********************************************************************
+        """
+        if self.threads:
+            pool = ThreadPool(self.workers)
+        else:
+            pool = Pool(self.workers, initializer=SolverServer.init_worker)
+        with pool:
+            self.pool = pool
+            if self.socket_path:
+                self.serve_socket()
+            else:
+                self.serve_stream(sys.stdin, sys.stdout)
+
+    @staticmethod
+    def init_worker():
+        """
+        ********************************************************************
+        *
+        * Method name: init_worker
+        *
+        * Description: Makes a worker process ignore Ctrl-C, which stops the
+        * server; the pool is then terminated by the server process.
+        *
+        * Return value: None
+        *********************************************************************
+        """
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    def serve_stream(self, requests, responses):
+        """
+        ********************************************************************
+        *
+        * Method name: serve_stream
+        *
+        * Description: Submits every request line to the pool and writes the
+        * responses as they complete, then waits for the pending ones. A
+        * stream has at most one solve per worker in the pool, so it cannot
+        * queue work ahead of the other connections; if its client stops
+        * reading, the rest of its requests and responses are dropped.
+        *
+        * Calling arguments:
+        * - requests: Text stream of JSON request lines.
+        * - responses: Text stream where the JSON responses are written.
+        *
+        * Return value: None
+        *********************************************************************
+        """
+        lock = threading.Lock()  # Responses arrive from the pool's result thread
+        closed = threading.Event()  # Set when the client stops reading the responses
+        slots = threading.Semaphore(self.workers)  # Solves of this stream in the pool at a time
+
+        def respond(response):
+            # Runs on the result thread shared by all the connections, so it must never raise
+            with lock:
+                if closed.is_set():
+                    return
+                try:
+                    responses.write(json.dumps(response) + "\n")
+                    responses.flush()
+                except (OSError, ValueError):  # Broken pipe, reset connection or closed stream
+                    closed.set()
+
+        def finish(response):
+            slots.release()
+            respond(response)
+
+        def fail(error):
+            slots.release()
+            respond({'id': None, 'status': "ERROR", 'error': repr(error)})
+
+        pending = []
+        for line in requests:
+            if closed.is_set():
+                break
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+            except json.JSONDecodeError as e:
+                respond({'id': None, 'status': "ERROR", 'error': f"Invalid JSON: {e}"})
+                continue
+            if not isinstance(request, dict):
+                respond({'id': None, 'status': "ERROR", 'error': "The request must be a JSON object"})
+                continue
+            while not slots.acquire(timeout=SolverServer.POLL_SECONDS) and not closed.is_set():
+                pass
+            if closed.is_set():
+                break
+            pending.append(self.pool.apply_async(SolverServer.solve, (request, self.cache_path, self.cache_size),
+                                                 callback=finish, error_callback=fail))
+        for result in pending:
+            while not closed.is_set() and not result.ready():
+                result.wait(SolverServer.POLL_SECONDS)
+
+    def serve_socket(self):
+        """
+        ********************************************************************
+        *
+        * Method name: serve_socket
+        *
+        * Description: Listens on the Unix socket; every connection is served
+        * in its own thread as a stream of requests and responses, sharing
+        * the pool with the other connections.
+        *
+        * Return value: None
+        *********************************************************************
+        """
+        server = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                requests = io.TextIOWrapper(self.rfile, encoding='utf-8')
+                responses = io.TextIOWrapper(self.wfile, encoding='utf-8', write_through=True)
+                server.serve_stream(requests, responses)
+
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)  # Left behind by a previous server
+        with socketserver.ThreadingUnixStreamServer(self.socket_path, Handler) as unix_server:
+            try:
+                unix_server.serve_forever()
+            except KeyboardInterrupt:
+                pass
+            finally:
+                os.unlink(self.socket_path)
+
+    @staticmethod
+    def option(request, name, default, choices):
+        """
+        ********************************************************************
+        *
+        * Method name: option
+        *
+        * Description: Reads an upper-case option of a request and checks
+        * that it is one of the valid values.
+        *
+        * Return value: The option value.
+        * List of Checked Exceptions: ValueError if the value is not valid
+        *********************************************************************
+        """
+        value = str(request.get(name, default)).upper()
+        if value not in choices:
+            raise ValueError(f"{name.capitalize()} {value} is not valid. Choose {', '.join(choices)}.")
+        return value
+
+    @staticmethod
+    def solve(request, cache_path=None, cache_size=1000):
+        """
+        ********************************************************************
+        *
+        * Method name: solve
+        *
+        * Description: Solves one request inside a worker, with the output
+        * of T3 written to a buffer of its own.
+        *
+        * Calling arguments:
+        * - request: Dictionary with the fields of the request.
+        * - cache_path: SQLite file of the solution cache, or None.
+        * - cache_size: Maximum number of results in the cache.
+        *
+        * Return value: The response dictionary.
+        *********************************************************************
+        """
+        from sokoban import Sokoban
+        from solution_cache import SolutionCache
+
+        request_id = request.get('id')
+        try:
+            level = request['level']
+            strategy = SolverServer.option(request, 'strategy', None, Sokoban.STRATEGIES)
+            max_depth = int(request['depth'])
+            mode = SolverServer.option(request, 'mode', 'MOVES', SolverServer.MODES)
+            heuristic = SolverServer.option(request, 'heuristic', 'MANHATTAN', SolverServer.HEURISTICS)
+            tt_policy = SolverServer.option(request, 'tt_policy', 'DEPTH', ['ALWAYS', 'DEPTH'])
+            tt_size = int(request.get('tt_size', 0))
+            weight = float(request.get('weight', 5.0))
+            weight_step = float(request.get('weight_step', 0.5))
+            max_nodes = request.get('max_nodes')
+            max_seconds = request.get('max_seconds')
+            max_nodes = int(max_nodes) if max_nodes is not None else None
+            max_seconds = float(max_seconds) if max_seconds is not None else None
+
+            output = io.StringIO()
+            sokoban = Sokoban(level)
+            sokoban.level_checker()
+            sokoban.output = output
+            sokoban.log = output  # The reports of IDA*, ANYTIME and the checkpoints go with the nodes
+            sokoban.quiet = bool(request.get('quiet', False))
+            if not sokoban.quiet:
+                print(level, file=output)
+            cache = SolutionCache(cache_path, cache_size) if cache_path else None
+            try:
+                found = sokoban.execute_T3(strategy, max_depth, bool(request.get('pruning', True)), mode, heuristic,
+                                           None, tt_size, tt_policy, None, None, cache, weight, weight_step,
+                                           max_nodes, max_seconds)
+            finally:
+                if cache is not None:
+                    cache.close()
+            return {'id': request_id, 'status': "OK", 'found': found, 'expanded': sokoban.expanded,
+                    'output': output.getvalue()}
+        except KeyError as e:
+            return {'id': request_id, 'status': "ERROR", 'error': f"Missing field {e}"}
+        except (ValueError, TypeError) as e:
+            return {'id': request_id, 'status': "ERROR", 'error': str(e)}
+        except Exception as e:
+            return {'id': request_id, 'status': "ERROR", 'error': repr(e)}
@@ -0,0 +1,109 @@
+class TranspositionTable:
+    """
+    ********************************************************************
+    *
+    * Class name: TranspositionTable
+    *
+    * Name of the original author: Carlos Ruiz García-Casarrios
+    *
+    * Description of the class: The TranspositionTable class is a fixed-size
+    * table used by IDA* to avoid searching the same state twice in one
+    * iteration. Each slot, chosen by the hash of the state key, holds the
+    * key, the cost and depth with which the state was reached and the
+    * iteration that stored it. A state reached again in the same iteration
+    * with an equal or higher cost and an equal or higher depth has a
+    * smaller or equal remaining budget, both for the threshold and for
+    * the depth limit, so its subtree can be skipped without losing
+    * solutions. In PUSHES mode the cost is not the depth, so both are
+    * needed. The memory used never grows: when two states fall in the
+    * same slot, the replacement policy decides which one stays. ALWAYS
+    * keeps the newest entry; DEPTH keeps the entry closest to the root
+    * (the one with the largest subtree), unless it comes from an older
+    * iteration.
+    *
+    * Required Files: none
+    *
+    *********************************************************************
+    """
+
+    POLICIES = ['ALWAYS', 'DEPTH']
+
+    def __init__(self, size, policy='DEPTH'):
+        """
+        ********************************************************************
+        *
+        * Method name: __init__
+        *
+        * Description: Allocates the slots and initializes the counters.
+        *
+        * Calling arguments:
+        * - size: Number of slots.
+        * - policy: Replacement policy (ALWAYS or DEPTH).
+        *
+        * Return value: None
+        *********************************************************************
+        """
+        self.size = size
+        self.policy = policy
+        self.keys = [None] * size
+        self.costs = [0] * size
+        self.depths = [0] * size
+        self.iterations = [0] * size
+        self.used = 0  # Number of occupied slots
+        self.hits = 0  # States skipped thanks to the table
+        self.stores = 0
+        self.replacements = 0  # Stores that overwrote a different state
+
+    def check(self, key, cost, depth, iteration):
+        """
+        ********************************************************************
+        *
+        * Method name: check
+        *
+        * Description: Looks up a state before expanding it. If the state was
+        * already reached in this iteration with a cost and a depth not
+        * higher than the current ones, it must be skipped; otherwise it is
+        * stored according to the replacement policy.
+        *
+        * Calling arguments:
+        * - key: The state key.
+        * - cost: Cost with which the state is reached now.
+        * - depth: Depth at which the state is reached now.
+        * - iteration: Number of the current IDA* iteration.
+        *
+        * Return value: True if the state must be skipped, False otherwise.
+        *********************************************************************
+        """
+        slot = hash(key) % self.size
+        stored = self.keys[slot]
+        if stored is None:
+            self.used += 1
+        elif self.iterations[slot] == iteration:
+            if stored == key:
+                if self.costs[slot] <= cost and self.depths[slot] <= depth:
+                    self.hits += 1
+                    return True
+            elif self.policy == 'DEPTH' and self.costs[slot] <= cost:
+                return False  # Keep the entry with the larger subtree
+        if stored is not None and stored != key:
+            self.replacements += 1
+        self.keys[slot] = key
+        self.costs[slot] = cost
+        self.depths[slot] = depth
+        self.iterations[slot] = iteration
+        self.stores += 1
+        return False
+
+    def report(self):
+        """
+        ********************************************************************
+        *
+        * Method name: report
+        *
+        * Description: Summarizes the use of the table.
+        *
+        * Return value: String with the size, policy, occupancy and counters.
+        *********************************************************************
+        """
+        return (f"TT:size={self.size},policy={self.policy},used={self.used},"
+                f"hits={self.hits},stores={self.stores},replacements={self.replacements}")
@@ -1,3 +1,8 @@
+import sys
+from array import array
+from itertools import chain
+
+
 class VisitedStates:
     """
     ********************************************************************
@@ -8,8 +13,10 @@ class VisitedStates:
     *
     * Description of the class: The VisitedStates class is responsible for
     * tracking the states that have already been visited in the search process.
-    * It uses a set to store the state IDs and provides methods to add new
-    * states to the visited set and check if a particular state has been visited.
+    * It uses a set to store the compact state keys and provides methods to
+    * add new states to the visited set and check if a particular state has
+    * been visited. FingerprintVisitedStates and DiskVisitedStates offer the
+    * same methods with bounded memory per state.
     *
     *********************************************************************
     """
@@ -20,7 +27,7 @@ class VisitedStates:
         *
         * Method name: __init__
         *
-        * Description: Initializes an empty set called 'visited' to store state IDs
+        * Description: Initializes an empty set called 'visited' to store state keys
         * that have been visited during the search process.
         *
         * Calling arguments: None
@@ -28,6 +35,7 @@ class VisitedStates:
         * Return value: None (initializes the 'visited' set).
         *********************************************************************
         """
+        self.backend = "SET"
         self.visited = set()  # Create an empty set to store visited states
 
     def add_state(self, state_id):
@@ -36,16 +44,16 @@ class VisitedStates:
         *
         * Method name: add_state
         *
-        * Description: Adds a given state ID to the set of visited states.
+        * Description: Adds a given state key to the set of visited states.
         * This method is used to mark a state as visited once it has been processed.
         *
         * Calling arguments:
-        * - state_id: The ID of the state to be added to the visited set.
+        * - state_id: The key of the state to be added to the visited set.
         *
         * Return value: None (adds the state to the visited set).
         *********************************************************************
         """
-        self.visited.add(state_id)  # Add the state ID to the visited set
+        self.visited.add(state_id)  # Add the state key to the visited set
 
     def is_visited(self, state_id):
         """
@@ -53,14 +61,96 @@ class VisitedStates:
         *
         * Method name: is_visited
         *
-        * Description: Checks if a given state ID is present in the visited set.
+        * Description: Checks if a given state key is present in the visited set.
         * This method is used to determine whether a state has already been processed.
         *
         * Calling arguments:
-        * - state_id: The ID of the state to check.
+        * - state_id: The key of the state to check.
         *
         * Return value:
-        * - True if the state ID is in the visited set, False otherwise.
+        * - True if the state key is in the visited set, False otherwise.
         *********************************************************************
         """
         return state_id in self.visited  # Return True if the state has been visited, False otherwise
+
+    def __len__(self):
+        return len(self.visited)
+
+    def bytes_used(self):
+        """
+        ********************************************************************
+        *
+        * Method name: bytes_used
+        *
+        * Description: Estimates the memory used by the set and its keys.
+        * The box tuples are shared with the nodes, so only the outer key
+        * tuples are counted.
+        *
+        * Return value: Number of bytes.
+        *********************************************************************
+        """
+        return sys.getsizeof(self.visited) + sum(sys.getsizeof(state_id) for state_id in self.visited)
+
+    def dump(self):
+        """
+        ********************************************************************
+        *
+        * Method name: dump
+        *
+        * Description: Flattens the visited states for a checkpoint. Every
+        * state is a (player cell, box cells) key, stored as a row of the
+        * player cell followed by the box cells.
+        *
+        * Return value: Tuple (dictionary with the row width, array of rows).
+        *********************************************************************
+        """
+        width = 1 + len(next(iter(self.visited))[1]) if self.visited else 1
+        return {'width': width}, array('i', chain.from_iterable((player,) + boxes for player, boxes in self.visited))
+
+    def load(self, info, states):
+        """
+        ********************************************************************
+        *
+        * Method name: load
+        *
+        * Description: Adds the states of a checkpoint written by dump, with
+        * the box tuples shared between the states.
+        *
+        * Calling arguments:
+        * - info: Dictionary returned by dump.
+        * - states: Array of rows returned by dump.
+        *
+        * Return value: None
+        *********************************************************************
+        """
+        width = info['width']
+        configurations = {}
+        for index in range(0, len(states), width):
+            boxes = tuple(states[index + 1:index + width])
+            self.visited.add((states[index], configurations.setdefault(boxes, boxes)))
+
+    def report(self):
+        """
+        ********************************************************************
+        *
+        * Method name: report
+        *
+        * Description: Summarizes the size of the visited set.
+        *
+        * Return value: String with the backend, number of states and bytes
+        * used.
+        *********************************************************************
+        """
+        return f"Visited:backend={self.backend},states={len(self.visited)},bytes={self.bytes_used()}"
+
+    def close(self):
+        """
+        ********************************************************************
+        *
+        * Method name: close
+        *
+        * Description: Releases the visited states. The set needs nothing.
+        *
+        * Return value: None
+        *********************************************************************
+        """